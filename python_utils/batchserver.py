@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import os
+import stat
+import socket
+import time
+import threading
+import Queue
+import SocketServer
+import BaseHTTPServer
+
+'''
+按行处理的常驻服务：每个连接一个线程，各连接的请求由Batcher合并成一批，
+一次调用process(lines)处理，process返回与lines一一对应的结果。
+协议：
+line: 客户端发送以'\\n'结束的若干行，服务端对每行返回一行结果，可以在一个连接上连续发送
+http: POST的body按'\\n'分行，返回对应的各行结果
+'''
+
+
+class Batcher:
+    def __init__(self, process, batchSize=256, maxDelay=0.002, threads=1):
+        '''
+        :param process: process(items)返回与items一一对应的结果列表
+        :param batchSize: 每批最多合并的项数（达到后不再等待）
+        :param maxDelay: 收到第一个请求后最多等待其他请求的秒数，越小延迟越低，越大每批越大
+        :param threads: 同时处理的批数，process把工作交给进程池时设为进程数
+        :return:
+        '''
+        self.process = process
+        self.batchSize = batchSize
+        self.maxDelay = maxDelay
+        self.batches = 0
+        self.items = 0
+        self.__queue = Queue.Queue()
+        for _ in range(threads):
+            thread = threading.Thread(target=self.__run)
+            thread.daemon = True
+            thread.start()
+
+    def submit(self, items):
+        ''' 提交一个请求并等待结果（堵塞）
+        :param items: list
+        :return: 与items一一对应的结果列表
+        '''
+        if not items:
+            return []
+        request = [items, None, threading.Event()]
+        self.__queue.put(request)
+        request[2].wait()
+        if isinstance(request[1], Exception):
+            raise request[1]
+        return request[1]
+
+    def __run(self):
+        while True:
+            requests = [self.__queue.get()]
+            count = len(requests[0][0])
+            deadline = time.time() + self.maxDelay
+            while count < self.batchSize:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.__queue.get(timeout=remaining)
+                except Queue.Empty:
+                    break
+                requests.append(request)
+                count += len(request[0])
+
+            items = [item for request in requests for item in request[0]]
+            try:
+                results = self.process(items)
+            except Exception as e:
+                results = None
+                error = e
+            self.batches += 1
+            self.items += len(items)
+            pos = 0
+            for request in requests:
+                if results is None:
+                    request[1] = error
+                else:
+                    request[1] = results[pos:pos + len(request[0])]
+                pos += len(request[0])
+                request[2].set()
+
+
+class LineHandler(SocketServer.BaseRequestHandler):
+    def setup(self):
+        if self.request.family != socket.AF_UNIX:
+            # 每批结果一次写出，不需要Nagle算法合并小包（它会和客户端的delayed ACK互相等待）
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+
+    def handle(self):
+        buf = ''
+        while True:
+            data = self.request.recv(64 * 1024)
+            if not data:
+                break
+            buf += data
+            end = buf.rfind('\n')
+            if end < 0:
+                continue
+            # 一次收到的所有完整行作为一个请求
+            lines = buf[:end].split('\n')
+            buf = buf[end + 1:]
+            self.request.sendall(''.join(result + '\n' for result in self.server.batcher.submit(lines)))
+        if buf:
+            self.request.sendall(''.join(result + '\n' for result in self.server.batcher.submit([buf])))
+
+
+class HttpHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # 响应头和body分几次写出，见LineHandler.setup
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('content-length', 0)))
+        result = '\n'.join(self.server.batcher.submit(body.split('\n')))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(result)))
+        self.end_headers()
+        self.wfile.write(result)
+
+    def address_string(self):
+        return str(self.client_address)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingTCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ThreadingUnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+
+def createServer(address, process, http=False, batchSize=256, maxDelay=0.002, threads=1):
+    ''' 创建服务，调用serve_forever开始处理请求
+    :param address: (host, port)或Unix socket的路径
+    :param process: 见Batcher
+    :param http: 使用http协议，否则使用line协议
+    :param batchSize: 见Batcher
+    :param maxDelay: 见Batcher
+    :param threads: 见Batcher
+    :return: server，server.batcher为合并请求的Batcher
+    '''
+    handler = HttpHandler if http else LineHandler
+    if isinstance(address, tuple):
+        server = ThreadingTCPServer(address, handler)
+    else:
+        if os.path.exists(address):
+            # 只删除上次留下的socket文件，不能删除其他文件
+            if not stat.S_ISSOCK(os.stat(address).st_mode):
+                raise ValueError('%s exists and is not a socket' % address)
+            os.remove(address)
+        server = ThreadingUnixServer(address, handler)
+    server.batcher = Batcher(process, batchSize, maxDelay, threads)
+    return server
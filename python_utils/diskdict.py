@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import os
+import struct
+import utils
+
+'''
+只读的磁盘字典：unicode key => 非负整数列表，文件按key排序，mmap后二分查找，
+多个进程打开同一文件时共享page cache。
+
+文件格式（little-endian）：
+header:  magic 'MTD2', 项数count(uint64), index的位置(uint64)
+records: 按key的utf8字节排序，每项为 key varint...
+index:   count项，每项为record的位置(uint64)、key的字节数(uint32)、value的字节数(uint32)，
+         二分查找时每步只需一次unpack_from和一次切片
+'''
+
+_MAGIC = 'MTD2'
+_HEADER = struct.Struct('<4sQQ')
+_ENTRY = struct.Struct('<QII')
+
+
+class DiskDict:
+    def __init__(self, path):
+        '''
+        :param path: write生成的文件，不存在时为空字典
+        :return:
+        '''
+        self.path = path
+        self.__map = ''
+        self.__count = 0
+        self.__index = 0
+        if os.path.exists(path):
+            self.__map = utils.mapFile(path)
+        if self.__map:
+            magic, self.__count, self.__index = _HEADER.unpack_from(self.__map, 0)
+            if magic != _MAGIC:
+                raise ValueError('not a DiskDict file: %s' % path)
+
+    def __len__(self):
+        return self.__count
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _entry(self, i):
+        ''' 第i项的key（utf8）和value的起止位置
+        '''
+        pos, keyLength, valueLength = _ENTRY.unpack_from(self.__map, self.__index + i * _ENTRY.size)
+        return self.__map[pos:pos + keyLength], pos + keyLength, pos + keyLength + valueLength
+
+    def _value(self, start, end):
+        value = bytearray(self.__map[start:end])
+        if max(value) < 0x80:  # 都是单字节的varint
+            return list(value)
+        return utils.decodeVarints(self.__map, start, len(value) - sum(1 for byte in value if byte >= 0x80))[0]
+
+    def get(self, key, default=None):
+        ''' 二分查找
+        :param key: unicode
+        :return: [int, ...]，不存在时返回default
+        '''
+        key = key.encode('utf8')
+        # 每次查找都要执行若干步，这里不调用_entry，减少函数调用
+        buf = self.__map
+        unpack = _ENTRY.unpack_from
+        index = self.__index
+        size = _ENTRY.size
+        lo = 0
+        hi = self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos, keyLength, valueLength = unpack(buf, index + mid * size)
+            midKey = buf[pos:pos + keyLength]
+            if midKey < key:
+                lo = mid + 1
+            elif midKey > key:
+                hi = mid
+            else:
+                return self._value(pos + keyLength, pos + keyLength + valueLength)
+        return default
+
+    def iteritems(self):
+        ''' 按key顺序返回(key utf8, [int, ...])
+        '''
+        for i in xrange(self.__count):
+            key, start, end = self._entry(i)
+            yield key, self._value(start, end)
+
+    def close(self):
+        if self.__map:
+            self.__map.close()
+        self.__map = ''
+        self.__count = 0
+
+    @staticmethod
+    def write(path, items):
+        ''' 写入按key排序的项，先写临时文件再rename，正在读旧文件的进程不受影响
+        :param path:
+        :param items: 按key（utf8）排序的(key utf8, [int, ...])，value不能为空
+        :return: 项数
+        '''
+        entries = []
+        tmpPath = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmpPath, 'wb') as fp:
+            fp.write(_HEADER.pack(_MAGIC, 0, 0))
+            pos = _HEADER.size
+            for key, value in items:
+                value = utils.encodeVarints(value)
+                entries.append(_ENTRY.pack(pos, len(key), len(value)))
+                fp.write(key)
+                fp.write(value)
+                pos += len(key) + len(value)
+            fp.write(''.join(entries))
+            fp.seek(0)
+            fp.write(_HEADER.pack(_MAGIC, len(entries), pos))
+        os.rename(tmpPath, path)
+        return len(entries)
+
+    @staticmethod
+    def merge(path, items, runs=(), maxOpen=64):
+        ''' 把新的项合并到path（已有的key保留原值），各有序序列归并，不需要把旧文件和runs读入内存
+        :param path:
+        :param items: {key unicode: [int, ...]}
+        :param runs: 其他DiskDict文件（如内存不够时写出的部分结果），path里没有的key才加入
+        :param maxOpen: 同时打开的文件数，runs更多时先分批归并成中间文件
+        :return: 合并后的项数
+        '''
+        import heapq
+        import tempfile
+        runs = list(runs)
+        intermediates = []
+        while len(runs) > maxOpen:
+            fd, run = tempfile.mkstemp(suffix='.mtd', dir=os.path.dirname(os.path.abspath(path)))
+            os.close(fd)
+            DiskDict.merge(run, {}, runs[:maxOpen], maxOpen)
+            intermediates.append(run)
+            runs = runs[maxOpen:] + [run]
+
+        newItems = sorted((key.encode('utf8'), value) for key, value in items.iteritems())
+        dicts = [DiskDict(path)] + [DiskDict(run) for run in runs]
+
+        def ranked(iterable, rank):
+            for key, value in iterable:
+                yield key, rank, value
+
+        def merged():
+            # 相同的key按rank排序，只取第一个：旧文件优先
+            sources = [ranked(d.iteritems(), rank) for rank, d in enumerate(dicts)]
+            sources.append(ranked(newItems, len(dicts)))
+            lastKey = None
+            for key, rank, value in heapq.merge(*sources):
+                if key != lastKey:
+                    yield key, value
+                    lastKey = key
+
+        try:
+            return DiskDict.write(path, merged())
+        finally:
+            for d in dicts:
+                d.close()
+            for run in intermediates:
+                os.remove(run)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import os
+import heapq
+import tempfile
+import collections
+
+'''
+unigram/bigram计数：内存里用一个Counter（bigram的key为两个token以空格连接），
+项数超过maxEntries时按key排序写到spillDir里的一个run文件并清空；
+各进程的run文件最后由mergeRuns归并，相同key的计数相加。
+run文件和结果文件每行为 utf8(ngram) \t count，按utf8字节排序。
+'''
+
+# Counter里每项（短unicode key + int）大约占用的字节数，用来把内存限制换算成项数
+ENTRY_BYTES = 150
+
+
+class NgramCounter:
+    def __init__(self, spillDir, maxEntries=1000000):
+        '''
+        :param spillDir: run文件目录
+        :param maxEntries: 内存里最多的项数
+        :return:
+        '''
+        self.spillDir = spillDir
+        self.maxEntries = maxEntries
+        self.counts = collections.Counter()
+        self.runs = []
+
+    def add(self, tokens):
+        ''' 统计一行的tokens，bigram不跨行
+        :param tokens: [unicode, ...]，不含空白字符
+        '''
+        counts = self.counts
+        for token in tokens:
+            counts[token] += 1
+        for i in xrange(len(tokens) - 1):
+            counts[tokens[i] + u' ' + tokens[i + 1]] += 1
+        if len(counts) > self.maxEntries:
+            self.spill()
+
+    def spill(self):
+        if not self.counts:
+            return
+        fd, path = tempfile.mkstemp(suffix='.ngram', dir=self.spillDir)
+        with os.fdopen(fd, 'wb') as fp:
+            for key, count in sorted((key.encode('utf8'), count) for key, count in self.counts.iteritems()):
+                fp.write('%s\t%d\n' % (key, count))
+        self.runs.append(path)
+        self.counts.clear()
+
+    def finish(self):
+        ''' 写出内存里剩下的计数
+        :return: 所有run文件
+        '''
+        self.spill()
+        return self.runs
+
+
+def _readRun(path):
+    with open(path, 'rb') as fp:
+        for line in fp:
+            key, count = line.rstrip('\n').rsplit('\t', 1)
+            yield key, int(count)
+
+
+def mergeRuns(paths, stdout, maxOpen=64):
+    ''' 归并run文件，相同ngram的计数相加后写入stdout，run文件在归并后删除
+    run文件超过maxOpen个时先分批归并成中间run文件，避免同时打开太多文件
+    :param paths: run文件
+    :param stdout: 以二进制方式打开
+    :param maxOpen: 同时打开的run文件数
+    :return: 不同ngram的个数
+    '''
+    paths = list(paths)
+    while len(paths) > maxOpen:
+        fd, path = tempfile.mkstemp(suffix='.ngram', dir=os.path.dirname(paths[0]))
+        with os.fdopen(fd, 'wb') as fp:
+            mergeRuns(paths[:maxOpen], fp, maxOpen)
+        paths = paths[maxOpen:] + [path]
+
+    count = 0
+    lastKey, lastCount = None, 0
+    for key, value in heapq.merge(*[_readRun(path) for path in paths]):
+        if key == lastKey:
+            lastCount += value
+            continue
+        if lastKey is not None:
+            stdout.write('%s\t%d\n' % (lastKey, lastCount))
+            count += 1
+        lastKey, lastCount = key, value
+    if lastKey is not None:
+        stdout.write('%s\t%d\n' % (lastKey, lastCount))
+        count += 1
+    for path in paths:
+        os.remove(path)
+    return count
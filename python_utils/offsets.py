@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import struct
+import utils
+
+'''
+切分结果的二进制格式：不写切分后的文本，每行只记录各音节（以及每段非Myanmar字符）的长度，
+读的时候从原文重建音节，所以原文里出现分隔符也不影响。
+行按'\\n'分开，行尾的'\\r'不属于该行；各音节的长度之和等于行的长度。
+
+文件格式（little-endian）：
+header:  magic 'MTO1', 行数count(uint64), index的位置(uint64)
+records: 每行一条，为音节数(varint)加上各音节的长度(varint，unicode字符数)
+index:   count项，每项为record的位置(uint64)、该行在原文里的起始字节(uint64)
+'''
+
+_MAGIC = 'MTO1'
+_HEADER = struct.Struct('<4sQQ')
+_ENTRY = struct.Struct('<QQ')
+
+
+def encodeRecord(lengths):
+    ''' 一行的record
+    :param lengths: 各音节的长度
+    :return: str
+    '''
+    if lengths and max(lengths) >= 0x80:
+        return utils.encodeVarint(len(lengths)) + utils.encodeVarints(lengths)
+    # 音节长度几乎都小于128，每个长度就是一个字节
+    return utils.encodeVarint(len(lengths)) + str(bytearray(lengths))
+
+
+class OffsetsWriter:
+    def __init__(self, fp):
+        '''
+        :param fp: 以'wb'打开，可以seek（写完后回到开头写header）
+        :return:
+        '''
+        self.fp = fp
+        self.pos = _HEADER.size
+        self.index = []
+        fp.write(_HEADER.pack(_MAGIC, 0, 0))
+
+    def write(self, records, entries):
+        ''' 写入若干行
+        :param records: 若干行的record连在一起
+        :param entries: [(record在records里的位置, 行在原文里的起始字节), ...]
+        '''
+        self.index.extend(_ENTRY.pack(self.pos + pos, textPos) for pos, textPos in entries)
+        self.fp.write(records)
+        self.pos += len(records)
+
+    def close(self):
+        self.fp.write(''.join(self.index))
+        self.fp.seek(0)
+        self.fp.write(_HEADER.pack(_MAGIC, len(self.index), self.pos))
+        self.fp.close()
+
+
+class OffsetsReader:
+    def __init__(self, path, textPath, coding='utf8'):
+        '''
+        :param path: OffsetsWriter写的文件
+        :param textPath: 切分的原文
+        :param coding: 原文编码
+        :return:
+        '''
+        self.__map = utils.mapFile(path)
+        magic, self.__count, self.__index = _HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC:
+            raise ValueError('not an offsets file: %s' % path)
+        self.__text = utils.mapFile(textPath)
+        with open(textPath, 'rb') as fp:
+            self.coding = utils.getRangeCoding(fp, coding)[0]
+
+    def __len__(self):
+        return self.__count
+
+    def lengths(self, i):
+        ''' 第i行各音节的长度
+        '''
+        pos = _ENTRY.unpack_from(self.__map, self.__index + i * _ENTRY.size)[0]
+        count, pos = utils.decodeVarint(self.__map, pos)
+        return utils.decodeVarints(self.__map, pos, count)[0]
+
+    def line(self, i):
+        ''' 第i行的原文，不含换行
+        '''
+        start = _ENTRY.unpack_from(self.__map, self.__index + i * _ENTRY.size)[1]
+        if i + 1 < self.__count:
+            end = _ENTRY.unpack_from(self.__map, self.__index + (i + 1) * _ENTRY.size)[1]
+        else:
+            end = len(self.__text)
+        line = self.__text[start:end].decode(self.coding)
+        if line.endswith(u'\n'):
+            line = line[:-1]
+        if line.endswith(u'\r'):
+            line = line[:-1]
+        return line
+
+    def syllables(self, i):
+        ''' 依次返回第i行的各音节，只在需要时解码该行
+        '''
+        line = self.line(i)
+        pos = 0
+        for length in self.lengths(i):
+            yield line[pos:pos + length]
+            pos += length
+
+    def __iter__(self):
+        for i in xrange(self.__count):
+            yield self.syllables(i)
+
+    def close(self):
+        if self.__map:
+            self.__map.close()
+        if self.__text:
+            self.__text.close()
@@ -33,13 +33,18 @@ join()    主进程阻塞，等待子进程的退出， join方法要在close或
 
 
 class Task:
-    def __init__(self, processes=10, userprocesses=False):
+    def __init__(self, processes=10, userprocesses=False, initializer=None, initargs=()):
         '''
         :param processes: 进程（线程）数
         :param userprocesses: 是否使用进程，默认使用线程
+        :param initializer: 每个进程（线程）启动时调用initializer(*initargs)
+        :param initargs:
         :return:
         '''
-        self.__pool = Pool(processes) if userprocesses else ThreadPool(processes)
+        if userprocesses:
+            self.__pool = Pool(processes, initializer, initargs)
+        else:
+            self.__pool = ThreadPool(processes, initializer, initargs)
 
     def add_async(self, func, args=(), kwargs={}, callback=None):
         '''返回结果对象，需要通过get获取结果（堵塞）
@@ -0,0 +1,2626 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import codecs
+from array import array
+import utils
+import sys
+import re
+import os
+import time
+
+
+'''
+缅甸语：Myanmar
+参考《A Rule-based Syllable Segmentation of Myanmar Text 》里的规则进行实现
+参考文献：http://www.aclweb.org/anthology/I08-3010
+http://www.nlpresearch-ucsy.edu.mm/NLP_UCSY/wsandpos.html  # 在线切分
+Myanmar Script共计12类，有75个字符组成
+其中：
+辅音组（Consonants group）：34个辅音字母
+中间字符组（Medials group）：4个中间字符
+依赖元音组（Dependent Vowels group）：8个元音
+Myanmar Sign Virama： is used for stacking consonant letters and it does not have a glyph
+用来堆叠辅音字母，他不具有字形
+Myanmar Sign Asat： is used in devowelising process (e.g. ဆင်)
+
+There are three dependent various signs in Group F.
+F： three dependent various signs 3个依赖多样化的字符
+
+The Group I consists of three independent vowels (ဤ, ဧ, ဪ) and three independent various signs (၌, ၍, ၏).
+I： three independent vowels (ဤ, ဧ, ဪ) and three independent various signs (၌, ၍, ၏).The characters in Group I can act as stand-alone syllables.
+    独立音节，3个独立元音和3个独立多样化字符
+
+Group E consists of four independent vowels (ဣ, ဥ, ဦ, ဩ) and Myanmar Symbol Aforementioned (၎).
+由4个独立元音和1个前导字符
+
+Each of the independent vowels in group E has its own syllable but they can also combine with other signs to form a syllable (e.g. ဥက3⁄4 ာ).
+E里的每个独立元音可以有它自己的音节，也可和其他字符组成音节
+
+Myanmar Symbol Aforementioned in Group E can never stand alone and it is always written as ၄င်း as a short form of လည်းေကာင်း .
+E里的前导符号永远不能独立，它总是写成4င်း作为လည်းေကာင်း缩写形式。
+
+Myanmar Letter Great Sa is always preceded by a consonant and is never written alone (e.g. မနုဿ ).
+Letter Great Sa总是以辅音，从不单独写（如မနုဿ）。
+
+There are ten Myanmar digits in the Digits group.
+数字组有10个数字
+
+The group P consists of two Myanmar punctuation marks.
+P：2个标点符号
+
+Myanmar script uses white space between phrases, which is taken into account in this study
+短语使用空白字符
+
+Category Name   Name                            Glyph                               Unicode Code Point
+C               Consonants                      ကခဂဃငစဆဇဈဉညဋဌဍဎဏတ            U+1000...U+1021
+                                                ထဒဓနပဖဗဘမယရလဝသဟဠအ
+M               Medials                          ျ     ြ     ွ        ှ                 U+103B...U+103E
+V               Dependent Vowel Signs            ါ ာ ိ ီ ု ူ ေ ဲ                         U+102B...U+1032
+S               Myanmar Sign Virama              ◌                                  U+1039
+A               Myanmar Sign Asat                 ်                                  U+103A
+F               Dependent Various Signs           ံ ့ း                                U+1036...U+1038
+I               Independent Vowels,             ဤ ဧ ဪ                           U+1024; U+1027; U+102A; U+104C;
+                Independent Various Signs       ၌ ၍ ၏                               U+104D; U+104F;
+E               Independent Vowels,             ဣ ဥ ဦ ဩ                             U+1023; U+1025;U+1026; U+1029;
+                Myanmar Symbol Aforementioned   ၎                                   U+104E;
+G               Myanmar Letter Great Sa         ဿ                                   U+103F
+D               Myanmar Digits                  ၀ ၁ ၂ ၃ ၄ ၅ ၆ ၇ ၈ ၉                 U+1040...U+1049
+P               Punctuation Marks               ၊ ။                                     U+104A...U+104B
+W               White space                                                         U+0020
+
+
+Syllable Structure:
+音节结构:
+A Myanmar syllable consists of one initial consonant, zero or more medials,
+一个缅甸音节由一个声母，零个或多个medials，
+zero or more vowels and optional dependent various signs.
+零个或多个元音和可选的依赖变形字符。
+Independent vowels, independent various signs and digits can act as stand-alone syllables.
+独立元音，独立各种标志和数字可以作为独立的音节。根据Unicode标准，元音后辅音存储。因此，缅甸元音符号E（U + 1031）之后的辅音存储虽然是摆在辅音渲染（如ေန）。 Medials可以在一个音节中最多出现三次（如ြမôာ）。元音可以在一个音节（如ေစာ）出现两次。在一个音节，第二个辅音可能会与一个AST的devowelising（如ဇင်）。每个在E组独立元音都有自己的音节，但它们也可以与其他标志（辅音，元音依赖，依赖各种标牌）相结合，形成一个音节（如ဣေòန研发，ဥက3/4ာ，ဦး，ေ ïသာင်း）。缅甸脚本的音节结构可以写成BNF（巴科斯范式）如下：
+According to the Unicode standard, vowels are stored after the consonant.
+Therefore, Myanmar vowel sign E (U+1031) is stored after the consonant
+although it is placed before the consonant in rendering (e.g. ေန).
+Medials may appear at most three times in a syllable (e.g. ြမôာ).
+Medials可以在一个音节中最多出现三次（如ြမôာ）。
+Vowels may appear twice in a syllable (e.g. ေစာ).
+元音可以在一个音节（如ေစာ）出现两次。
+In a syllable, a second consonant may come together with an Asat for devowelising (e.g. ဇင်) .
+音节中，第二个辅音可能会与一个Asat的devowelising（如ဇင်）
+Each of the independent vowels in group E has its own syllable but they
+can also combine with other signs (consonants, dependent vowels, dependent various signs)
+to form a syllable (e.g. ဣေòနÐ, ဥက3⁄4 ာ, ဦး, ေïသာင်း ).
+E中的每个独立元音都有自己的音节，但他们也可以和其他字符（辅音，依赖元音，依赖变形字符）相结合形成一个音节(e.g. ဣေòနÐ, ဥက3⁄4 ာ, ဦး, ေïသာင်း ).
+The syllable structure of Myanmar script can be written in BNF (Backus-Naur Form) as follows:
+缅甸脚本的音节结构可以写成BNF（Backus-Naur Form）如下：
+Syllable ::= C{M}{V}{F} | C{M}V+ A | C{M}{V}CA[F] | E{V}[CA][F]  | I | D
+
+{} the item may appear zero or more times  {}出现次数>=0
++ the item may appear one or more times    +出现次数>=1
+[] the item may appear zero or one time    []出现次数==0 or ==1
+
+A finite state machine or finite state automaton (FSA) can be employed to
+demonstrate the syllable structure of Myanmar script.
+A finite state machine is a model of behavior composed of a finite number of states,
+transitions between those states, and actions.
+The starting state is shown by a bold circle and double circles indicate final or accepting states.
+The above figure shows a finite state automaton that can realize a Myanmar syllable.
+Examples of Myanmar syllables and their equivalent Unicode code points are shown in Table 2.
+
+
+
+Syllable Segmentation Rules：
+Syllable Segmentation Rules Typically, a syllable boundary can be determined
+by comparing pairs of characters to find whether a break is possible or not between them.
+通常情况下，一个音节边界可以通过比较字符对来确定是否可以分割或者不在他们之间
+However, in some cases it is not sufficient to determine a syllable boundary
+by just comparing two characters.
+然而某些情况下，由两个字符确定音节边界不够充分
+
+The following sections explain these cases and give examples.
+1.Devowelising（去元音读音）：
+In one syllable, a consonant may appear twice but the second consonant is
+used for the devowelising process in conjunction with an Asat (U+103A MYANMAR SIGN ASAT).
+一个音节中，一个辅音可能出现两次，但是第二个辅音用于devowelising过程中，与Asat接合使用
+
+Therefore the character after the second consonant should be further checked for an Asat.
+因此，第二个辅音后的字符应该进一步检查Asat。
+If the character after the second consonant is an Asat, there should be no syllable break
+before the second consonant.
+如果第二个辅音后面的字符是Asat，那么第二个辅音之前不能分割
+
+eg: ဆင် =》 ဆ င  ်  (elephant) 前两个都为辅音（C），最后一个为A
+            C C A
+
+
+2.Syllable Chaining：
+Subjoined characters are shown by using an invisible Virama sign (U+1039 MYANMAR SIGN VIRAMA)
+to indicate that the following character is subjoined and should take a subjoined form.
+In this case, if the character after the second consonant is an invisible Virama sign,
+there should be no syllable break before the second and third consonant.
+在这种情况下，如果第二个辅音后的字符是Virama，那么第二个音节和第三个音节之前不能分隔。
+Although there are two syllables in a subjoined form, it is not possible to separate
+them in written form and they are therefore treated as one syllable.
+eg: ဝတÏု  =>   ဝ တ ◌ ထ ု        (novel)
+                C C S C V
+
+3.Kinzi
+Kinzi is a special form of devowelised Nga (U+1004 MYANMAR LETTER NGA) with the following
+letter underneath, i.e., subjoined.
+In this case, if the character after the second consonant is an Asat and the next character
+after Asat is an invisible Virama sign (U+1039 MYANMAR SIGN VIRAMA) then there should be no
+syllable break before the second and third consonant. Kinzi also consists of two syllables
+but it is treated as one syllable in written form.
+在这种情况下，如果第二个字符后面是Asat和Asat之后的下一个字符是Virama，那么第二个辅音和
+第三个辅音没有分隔，Kinzi同样包含两个音节，但是在书面形式中视为一个音节
+
+eg:မဂüလာ =>  မ င ် ◌ ဂ - လ ာ        (blessing)
+              C C A S C - C V
+
+4.Loan Words：外来词
+Usage of loan words can be found in Myanmar text.
+Although loan words do not follow the Myanmar syllable structure,
+虽然外来词不按缅甸语的音节切分规则，
+their usage is common and the segmentation rules for these words are considered in this study.
+eg：မားစ်ðဂိုဟ်  =>   မ ာ း စ ် - ဂ ြ ိ ု ဟ ် (Mars)
+                    C V F C A - C M V V C A
+
+5.Great Sa
+There should be no syllable break before great Sa (U+103F MYANMAR LETTER GREAT SA)
+as great Sa acts like a stacked သÛ and devowelises the preceding consonant.
+eg:  မနုဿ =>  မ - န ု ဿ  (human)
+               C - C V G
+
+6.Contractions
+There are usages of double-acting consonants in Myanmar text.
+The double-acting consonant acts as both the final consonant of one syllable and the
+initial consonant of the following syllable. There are two syllables in a contracted
+form but they cannot be segmented in written form and there should be no syllable break
+between them.
+eg:  ေယာက်ျား   =>   ယ ေ  ာ က ်  ျ ာ း  (man)
+                     C  V  V C A M V F
+
+Table 3. Syllable Break Status and Definition
+Break Status        Definition
+-1                  Illegal spelling order
+ 0                  No break after 1st character
+ 1                  Break after 1st character
+ 2                  Break after 2nd character
+ 3                  Break after 3rd character
+ 4                  Break after 4th character
+
+Implementation 实现:
+Syllable segmentation rules are presented in the form of letter sequence tables (Tables 4-6).
+音节切分规则呈现在字母序列表（表4-6）的形式。
+The tables were created by comparing each pair of character categories.
+通过比较字符对类别来创建表。
+However, it is not sufficient to determine all syllable breaks by comparing only two characters.
+然而，通过比较仅两个字符是不足以确定所有音节的。
+In some cases, a maximum of four consecutive characters need to be considered to determine
+a possible syllable boundary.
+在一些情况下，最多需要连续考虑四个字符，以确定一个可能的音节分隔
+Two additional letter sequence tables were created for this purpose (Tables 5 and 6).
+为此目的创建（表5和6）两个附加的字母顺序表。
+Table 4 defines the break status for each pair of two consecutive characters.
+表4定义了每对的两个连续的字符的分隔状态。
+Table 5 and 6 define the break status for each pair of three and four consecutive characters, respectively.
+表5和6限定​​为每一对分别考虑三个和四个连续字符来确定分隔状态。
+The symbol U in the Table 4 and 5 stands for undefined cases.
+符号U在表4和5代表不确定的情况。
+Cases undefined in Table 4 are defined in the Table 5, and those undefined in Table 5 are then defined in Table 6.
+表4中未定义的在表5中定义，和那些在表5中未定义的在表6中定义。
+The syllable segmentation program obtains the break status for each pair of characters by
+comparing the input character sequence with the letter sequence tables.
+音节分词程序通过与字母顺序表比较输入字符序列获得用于每对字符的分隔状态。
+The syllable break status and definitions are shown in Table 3.
+音节分隔状态和定义见表3。
+The break status -1 indicates a breach of canonical spelling order and a question mark is appended after the ambiguous character pair.
+分隔状态-1表示违反规范的拼写顺序和模糊的字符对后一个问号被追加。
+The status 0 means there should be no syllable break after the first character.
+状态0表示应该是第一个字符后无音节的分隔。
+For break cases, a syllable breaking symbol (i.e. B in the flowchart) is inserted at each syllable boundary of the input string.
+对于分隔的情况，一个音节分隔符号（i.e. 流程图里的B）作为每一个音节的边界
+The syllable segmentation process is shown in the flowchart in Figure 2.
+
+
+Method and Results：
+A syllable segmentation program was developed to evaluate the algorithm and segmentation rules.
+
+
+The program accepts the Myanmar text string and shows the output string in a segmented form.
+
+
+The program converts the input text string into equivalent sequence of category form
+(e.g. CMCACV for ြမန်မာ) and compares the converted character sequence with the letter
+sequence tables to determine syllable boundaries.
+程序中的输入文本串转换成类形式的等效序列（如CMCACV为ြမန်မာ），并比较以字母顺序表的
+转换的字符序列，以确定音节边界。
+
+A syllable segmented Myanmar text string is shown as the output of the program.
+The symbol "|" is used to represent the syllable breaking point.
+符号“|”用于表示音节分隔符。
+In order to evaluate the accuracy of the algorithm, a training corpus was developed
+by extracting 11,732 headwords from Myanmar Orthography (Myanmar Language Commission, 2003).
+The corpus contains a total of 32,238 Myanmar syllables.
+为了评估算法的准确性，训练语料是由来自缅甸正字（缅甸语言文字工作委员会，2003）
+抽取11732词条开发。该语料库共收录了32238缅甸音节。
+These syllables were tested in the program and the segmented results were manually checked.
+这些音节均在程序测试和分割结果进行人工检查。
+The results showed 12 errors of incorrectly segmented syllables, thus achieving
+accuracy of 99.96% for segmentation.
+结果显示，不正确地分割音节12错误，从而实现了99.96％的准确度进行分割。
+The few errors occur with the Myanmar Letter Great Sa ‘ဿ’ and the Independent Vowel ‘ဥ’.
+缅甸字符Great Sa‘ဿ’和独立元音‘ဥ’出现了一些错误。
+The errors can be fixed by updating the segmentation rules of these two characters in letter sequence tables.
+这些错误可以固定通过更新这两个字符的分割规则字母序列表。
+
+'''
+
+# 缅甸语字符集范围：Unicode 8.0
+MyanmarCharacterCode = [(u'\u1000', u'\u109F'),  # Myanmar
+                        (u'\uAA60', u'\uAA7F'),  # Myanmar Extended-A
+                        (u'\uA9E0', u'\uA9FF'),  # Myanmar Extended-B
+                        ]
+
+
+class _TranslateTable(dict):
+    ''' unicode.translate用的映射表，表里没有的字符映射为fallback（并缓存，之后由C直接查到）
+    '''
+    def __init__(self, table, fallback):
+        dict.__init__(self, table)
+        self.fallback = fallback
+
+    def __missing__(self, code):
+        self[code] = self.fallback
+        return self.fallback
+
+
+class MyanmarTokenizer:
+    # Category name
+    _CATEGORY_NAMES = ['C', 'M', 'V', 'S', 'A', 'F', 'I', 'E', 'G', 'D', 'P', 'W']
+    # Category's Unicode Code Point
+    _CATEGORY_RANGE = [
+        ['C', range(0x1000, 0x1021 + 1)],  # Consonants
+        ['M', range(0x103B, 0x103E + 1)],  # Medials
+        ['V', range(0x102B, 0x1032 + 1)],  # Dependent Vowel Signs
+        ['S', [0x1039]],  # Myanmar Sign Virama
+        ['A', [0x103A]],  # Myanmar Sign Asat
+        ['F', range(0x1036, 0x1038 + 1)],  # Dependent Various Signs
+        ['I', [0x1024, 0x1027, 0x102A, 0x104C, 0x104D, 0x104F]],  # Independent Vowels,Independent Various Signs
+        ['E', [0x1023, 0x1025, 0x1026, 0x1029, 0x104E]],  # Independent Vowels,Myanmar Symbol Aforementioned
+        ['G', [0x103F]],  # Myanmar Letter Great Sa
+        ['D', range(0x1040, 0x1049 + 1)],  # Myanmar Digits
+        ['P', range(0x104A, 0x104B + 1)],  # Punctuation Marks
+        ['W', [0x0020]],  # White space
+    ]
+    # Category of characters outside _CATEGORY_RANGE: non-Myanmar, unassigned and extended code points
+    _CATEGORY_UNKNOWN = '?'
+    # Myanmar codes
+    _MYANMAR_CODES_START = 0x1000
+    _MYANMAR_CODES_END = 0x109f
+    _MYANMAR_CODES = [unichr(n) for n in range(_MYANMAR_CODES_START, _MYANMAR_CODES_END + 1)]
+    _PATTERN_MYANMAR_CODES = re.compile(u'([%s-%s]+)' % (unichr(_MYANMAR_CODES_START), unichr(_MYANMAR_CODES_END)),
+                                        re.U)
+
+    # Syllable Break Status and Definition
+    _BREAK_STATUS_UNDEFINED = -2  # undefined cases
+    _BREAK_STATUS_ILLEGAL_SPELLING_ORDER = -1  # Illegal spelling order
+    _BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER = 0  # No break after 1 st character
+    _BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER = 1  # Break after 1 st character
+    _BREAK_STATUS_BREAK_AFTER_2ND_CHARACTER = 2  # Break after 2 nd character
+    _BREAK_STATUS_BREAK_AFTER_3RD_CHARACTER = 3  # Break after 3 rd character
+    _BREAK_STATUS_BREAK_AFTER_4TH_CHARACTER = 4  # Break after 4 th character
+
+    # Letter Sequence Table: 2nd, 3rd, 4th character
+    _LETTER_SEQUENCE_TABLE_INDEX = {c: i for i, c in enumerate('A C D E F G I M P S V W'.split())}
+    _LETTER_SEQUENCE_TABLE_2ND_CHARACTER = {
+        # A C D E F G I M P S V W
+        'A': (-1, -2, 1, 1, 0, -1, 1, 0, 1, 0, 0, 1),
+        'C': (0, -2, 1, 1, 0, 0, 1, 0, 1, 0, 0, 1),
+        'D': (-1, 1, 0, 1, -1, -1, 1, -1, 1, -1, -1, 1),
+        'E': (-1, -2, 1, 1, 2, 0, 1, -1, 1, -1, 0, 1),
+        'F': (-1, -2, 1, 1, 2, -1, 1, -1, 1, -1, -1, 1),
+        'G': (-1, 1, 1, 1, 0, -1, 1, -1, 1, -1, 0, 1),
+        'I': (-1, 1, 1, 1, -1, -1, 1, -1, 1, -1, -1, 1),
+        'M': (2, -2, 1, 1, 0, 0, 1, 0, 1, -1, 0, 1),
+        'P': (-1, 1, 1, 1, -1, -1, 1, -1, 1, -1, -1, 1),
+        'S': (-1, 0, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1),
+        'V': (2, -2, 1, 1, 0, 0, 1, -1, 1, -1, 0, 1),
+        'W': (-1, 1, 1, 1, -1, -1, 1, -1, 1, -1, -1, 0),
+    }
+    _LETTER_SEQUENCE_TABLE_3RD_CHARACTER = {
+        # A C D E F G I M P S V W
+        'AC': (3, 1, 1, 1, 1, 1, 1, -2, 1, 1, 1, 1),
+        'CC': (0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1),
+        'EC': (0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1),
+        'FC': (3, 1, 1, 1, 1, 1, 1, -2, 1, 1, 1, 1),
+        'MC': (0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1),
+        'VC': (0, 1, 1, 1, 1, 1, 1, -2, 1, 0, 1, 1),
+    }
+    _LETTER_SEQUENCE_TABLE_4TH_CHARACTER = {
+        # A C D E F G I M P S V W
+        'ACM': (4, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1),
+        'FCM': (4, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1),
+        'VCM': (4, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1),
+    }
+
+    # Compiled Letter Sequence Table: category id 0..11 (same order as _LETTER_SEQUENCE_TABLE_INDEX),
+    # characters outside _CATEGORY_RANGE use _CATEGORY_ID_UNKNOWN, every id takes _CATEGORY_ID_BITS bits
+    _CATEGORY_ID_UNKNOWN = len(_LETTER_SEQUENCE_TABLE_INDEX)
+    _CATEGORY_ID_BITS = 4
+    # built by _compileLetterSequenceTables
+    _CATEGORY_TABLE = None  # unicode.translate table: code => category name
+    _CATEGORY_ID_TABLE = None  # unicode.translate table: code => unichr(category id)
+    _BREAK_TABLE_2ND_CHARACTER = None
+    _BREAK_TABLE_3RD_CHARACTER = None
+    _BREAK_TABLE_4TH_CHARACTER = None
+    # Letter Sequence Table编译成的DFA，第一次使用时由_dfa调用_compileDFA生成
+    _DFA = None
+    # Letter Sequence Table编译成的正则，每次匹配到下一个标记（separator或'?'）或结尾，
+    # 第一次使用时由_syllablePattern调用_compileSyllablePattern生成
+    _PATTERN_SYLLABLE = None
+    # numpy engine用的数组，第一次使用时由_numpyTables生成
+    _NUMPY_TABLES = None
+    # numpy engine每次处理的行数
+    _NUMPY_BLOCK_LINES = 10000
+    # newRuns超过这个项数时排序写到临时文件（见_spillNewRuns），内存占用与语料大小无关
+    _NEW_RUNS_LIMIT = 100000
+
+    # Syllable segmentation engines: engine name => segmentation method of a Myanmar sentence
+    _ENGINES = {
+        'rule': '_syllableSegmentationRule',  # _syllableSegmentation on the code2Category string
+        'table': '_syllableSegmentationTable',  # compiled flat Letter Sequence Table
+        'dfa': '_syllableSegmentationDFA',  # deterministic finite automaton compiled from the tables
+        'regex': '_syllableSegmentationRegex',  # re pattern compiled from the tables
+        'numpy': '_syllableSegmentationNumpy',  # vectorized with numpy (optional dependency), see cutText
+    }
+    _DEFAULT_ENGINE = 'table'
+
+    separator = property(lambda self: '|')
+
+    def __init__(self, separator='|', engine=_DEFAULT_ENGINE, cacheSize=0, dictionaryPath=None, stats=False,
+                 lexiconPath=None):
+        '''
+        :param separator: Syllable breaking symbol
+        :param engine: _ENGINES中的engine
+        :param cacheSize: cut按Myanmar部分缓存切分结果的LRU缓存项数，0不缓存
+        :param dictionaryPath: 磁盘字典（Myanmar部分 => 各音节长度），cut先在其中二分查找，
+            未找到的Myanmar部分记入newRuns，由saveDictionary合并进文件
+        :param stats: cut是否记录统计（见getStats），不启用时cut只多一次判断
+        :param lexiconPath: buildLexicon生成的词典（音节序列的double-array trie），words使用
+        '''
+        if engine not in MyanmarTokenizer._ENGINES:
+            raise ValueError('unknown engine: %s' % engine)
+        if engine == 'numpy':
+            import numpy  # numpy engine需要numpy
+        self.separator = separator
+        self.engine = engine
+        self.cache = utils.LRUCache(cacheSize) if cacheSize > 0 else None
+        self.dictionary = None
+        if dictionaryPath is not None:
+            from diskdict import DiskDict
+            self.dictionary = DiskDict(dictionaryPath)
+        self.newRuns = {}
+        self.newRunsSpills = []
+        self.stats = None
+        if stats:
+            self.resetStats()
+        self.lexicon = None
+        if lexiconPath is not None:
+            from trie import DoubleArrayTrie
+            self.lexicon = DoubleArrayTrie(lexiconPath)
+
+    def code2Category(self, sentence):
+        ''' 每个Myanmar字符转换成category，_CATEGORY_RANGE以外的字符以及非Myanmar字符（包括空格）为_CATEGORY_UNKNOWN
+        '''
+        sentence = utils.toUnicode(sentence)
+        return sentence.translate(MyanmarTokenizer._CATEGORY_TABLE).encode('ascii')
+
+    def _code2CategoryId(self, sentence):
+        ''' 每个字符转换成category id，_CATEGORY_RANGE以外的字符为_CATEGORY_ID_UNKNOWN
+        :param sentence: unicode
+        :return: bytearray
+        '''
+        return bytearray(sentence.translate(MyanmarTokenizer._CATEGORY_ID_TABLE).encode('latin-1'))
+
+    @classmethod
+    def _compileLetterSequenceTables(cls):
+        ''' 把Letter Sequence Table编译成以category id为下标的扁平数组，类加载时执行一次
+        前1~3个字符的category id（上下文）按_CATEGORY_ID_BITS打包成整数，
+        table[(context << _CATEGORY_ID_BITS) | id]即为break status，表里没有的为_BREAK_STATUS_UNDEFINED
+        '''
+        index = cls._LETTER_SEQUENCE_TABLE_INDEX
+        bits = cls._CATEGORY_ID_BITS
+        tables = []
+        for contextLen, letterSequenceTable in enumerate((cls._LETTER_SEQUENCE_TABLE_2ND_CHARACTER,
+                                                          cls._LETTER_SEQUENCE_TABLE_3RD_CHARACTER,
+                                                          cls._LETTER_SEQUENCE_TABLE_4TH_CHARACTER), 1):
+            table = [cls._BREAK_STATUS_UNDEFINED] * (1 << (bits * (contextLen + 1)))
+            for categorys, status in letterSequenceTable.items():
+                context = 0
+                for category in categorys:
+                    context = (context << bits) | index[category]
+                for i, breakStatus in enumerate(status):
+                    table[(context << bits) | i] = breakStatus
+            tables.append(tuple(table))
+        (cls._BREAK_TABLE_2ND_CHARACTER, cls._BREAK_TABLE_3RD_CHARACTER,
+         cls._BREAK_TABLE_4TH_CHARACTER) = tables
+        # 与原来的code2Category一致：Myanmar字符以外（包括空格）都是_CATEGORY_UNKNOWN
+        cls._CATEGORY_TABLE = _TranslateTable(((_code, unicode(_name))
+                                               for _name, _range in cls._CATEGORY_RANGE
+                                               for _code in _range
+                                               if cls._MYANMAR_CODES_START <= _code <= cls._MYANMAR_CODES_END),
+                                              unicode(cls._CATEGORY_UNKNOWN))
+        cls._CATEGORY_ID_TABLE = _TranslateTable(((_code, unichr(index[_name]))
+                                                  for _name, _range in cls._CATEGORY_RANGE
+                                                  for _code in _range), unichr(cls._CATEGORY_ID_UNKNOWN))
+        for name in cls._CATEGORY_NAMES:
+            setattr(cls, 'Category' + name, name)
+        # 每个缅甸语字符对应的Category
+        cls.codeCategory = {unichr(_code): _name
+                            for _name, _range in cls._CATEGORY_RANGE
+                            for _code in _range}
+
+    @classmethod
+    def _hasContext(cls, table, context):
+        ''' 编译后的table里是否有该上下文，没有时不用再看后面的字符，break status一定是undefined
+        '''
+        bits = cls._CATEGORY_ID_BITS
+        return any(table[(context << bits) | i] != cls._BREAK_STATUS_UNDEFINED for i in range(1 << bits))
+
+    @classmethod
+    def _firstBreakStatus(cls, ids, final):
+        ''' 用编译后的Letter Sequence Table确定ids第一个字符处的break status
+        :param ids: category id序列
+        :param final: ids后面是否已经没有字符
+        :return: (break status, 确定的字符数)，undefined按break after 1st character返回；
+                 需要看后面的字符才能确定时返回None
+        '''
+        bits = cls._CATEGORY_ID_BITS
+        undefined = cls._BREAK_STATUS_UNDEFINED
+        if len(ids) < 2:
+            if final and ids:
+                return cls._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER, 1
+            return None
+        context = (ids[0] << bits) | ids[1]
+        breakStatus = cls._BREAK_TABLE_2ND_CHARACTER[context]
+        if breakStatus == undefined:
+            if len(ids) >= 3:
+                context = (context << bits) | ids[2]
+                breakStatus = cls._BREAK_TABLE_3RD_CHARACTER[context]
+                if breakStatus == undefined:
+                    if len(ids) >= 4:
+                        breakStatus = cls._BREAK_TABLE_4TH_CHARACTER[(context << bits) | ids[3]]
+                    elif not final and cls._hasContext(cls._BREAK_TABLE_4TH_CHARACTER, context):
+                        return None  # 等第4个字符
+            elif not final and cls._hasContext(cls._BREAK_TABLE_3RD_CHARACTER, context):
+                return None  # 等第3个字符
+
+        if breakStatus == cls._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+            return breakStatus, 1
+        if breakStatus == cls._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER or breakStatus == undefined:
+            return cls._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER, 1
+        if breakStatus == cls._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+            return breakStatus, 2
+        return breakStatus, breakStatus
+
+    @classmethod
+    def _resolveBreakStatus(cls, ids, final):
+        ''' 从左到右尽可能多地确定ids里的break status，供_compileDFA使用
+        :param ids: 还未确定break status的category id序列
+        :param final: ids后面是否已经没有字符
+        :return: ([(index of ids, break status), ...], 已确定的字符数)
+                 只返回需要插入标记（separator或'?'）的位置
+        '''
+        marks = []
+        start = 0
+        while start < len(ids):
+            step = cls._firstBreakStatus(ids[start:], final)
+            if step is None:
+                break
+            breakStatus, length = step
+            start += length
+            if breakStatus != cls._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+                marks.append((start - 1, breakStatus))
+        return marks, start
+
+    @classmethod
+    def _dfa(cls):
+        if cls._DFA is None:
+            cls._compileDFA()
+        return cls._DFA
+
+    @classmethod
+    def _syllablePattern(cls):
+        if cls._PATTERN_SYLLABLE is None:
+            cls._compileSyllablePattern()
+        return cls._PATTERN_SYLLABLE
+
+    @classmethod
+    def _compileDFA(cls):
+        ''' 把Letter Sequence Table编译成一个DFA，从左到右每个字符只做一次状态转移，不回溯
+        状态是还未确定break status的category id序列（最多3个），从空序列（状态0）开始广度优先生成，
+        结果只包含tuple和int，可以直接用marshal/json序列化：
+            states: 每个状态对应的category id序列
+            transitions: transitions[(state << _CATEGORY_ID_BITS) | id] => 下一个状态
+            marks: marks[(state << _CATEGORY_ID_BITS) | id] => ((distance, break status), ...)
+                   distance为标记所在字符与当前字符的距离，break status为-1时标记为'?'，否则为separator
+            finals: finals[state] => 输入结束时的((distance, break status), ...)，distance相对最后一个字符
+        '''
+        bits = cls._CATEGORY_ID_BITS
+        states = [()]
+        stateIndex = {(): 0}
+        transitions = []
+        marks = []
+        finals = []
+        state = 0
+        while state < len(states):
+            window = states[state]
+            for id in range(1 << bits):
+                if id > cls._CATEGORY_ID_UNKNOWN:
+                    transitions.append(0)
+                    marks.append(())
+                    continue
+                ids = window + (id,)
+                resolved, start = cls._resolveBreakStatus(ids, False)
+                nextWindow = ids[start:]
+                if nextWindow not in stateIndex:
+                    stateIndex[nextWindow] = len(states)
+                    states.append(nextWindow)
+                transitions.append(stateIndex[nextWindow])
+                marks.append(tuple((len(ids) - 1 - i, breakStatus) for i, breakStatus in resolved))
+            resolved, start = cls._resolveBreakStatus(window, True)
+            finals.append(tuple((len(window) - 1 - i, breakStatus) for i, breakStatus in resolved))
+            state += 1
+        cls._DFA = {'states': tuple(states), 'transitions': tuple(transitions),
+                    'marks': tuple(marks), 'finals': tuple(finals)}
+
+    @classmethod
+    def _compileSyllablePattern(cls):
+        ''' 把Letter Sequence Table编译成一个re，由re.finditer在C里完成音节扫描
+        每一步（确定一个break status）对应一个分支：被确定的字符 + 参与判断的后续字符（零宽断言），
+        同一位置只有一个分支能匹配，所以匹配结果与_syllableSegmentation逐步判断一致。
+        一次匹配 = 若干不分隔的步骤(status 0) + 一个结束步骤，结束步骤的分组名：
+            b: 之后插入separator;  i: 非法拼写顺序，之后插入'?';  e: 到达结尾
+        '''
+        unknown = cls._CATEGORY_ID_UNKNOWN
+        index = cls._LETTER_SEQUENCE_TABLE_INDEX
+        categoryCodes = [[] for _ in range(unknown)]
+        for _name, _range in cls._CATEGORY_RANGE:
+            categoryCodes[index[_name]].extend(_range)
+
+        def characterClass(ids):
+            if len(ids) == unknown + 1:
+                return u'.'
+            codes = set(_code for id in range(unknown) if (id in ids) != (unknown in ids)
+                        for _code in categoryCodes[id])
+            ranges = []
+            for code in sorted(codes):
+                if ranges and ranges[-1][1] == code - 1:
+                    ranges[-1][1] = code
+                else:
+                    ranges.append([code, code])
+            items = u''.join(unichr(a) if a == b else u'%s-%s' % (unichr(a), unichr(b)) for a, b in ranges)
+            return (u'[^%s]' if unknown in ids else u'[%s]') % items
+
+        # 枚举每一步：(每个位置的category id集合, 之后是否为结尾, break status, 确定的字符数)
+        steps = {}
+        windows = [(id,) for id in range(unknown + 1)]
+        while windows:
+            window = windows.pop()
+            step = cls._firstBreakStatus(window, False)
+            if step is None:
+                step = cls._firstBreakStatus(window, True)
+                windows.extend(window + (id,) for id in range(unknown + 1))
+                key = (tuple(frozenset([id]) for id in window[:-1]), True) + step
+            else:
+                key = (tuple(frozenset([id]) for id in window[:-1]), False) + step
+            steps.setdefault(key, set()).add(window[-1])
+        # 只有一个位置的集合不同的分支可以合并：先合并最后一个位置，再合并第一个位置
+        merged = {}
+        for (slots, final, breakStatus, length), ids in steps.items():
+            slots = slots + (frozenset(ids),)
+            merged.setdefault((slots[1:], final, breakStatus, length), set()).update(slots[0])
+
+        alternatives = {'n': [], 'b': [], 'i': [], 'e': []}
+        for (slots, final, breakStatus, length), ids in merged.items():
+            slots = (frozenset(ids),) + slots
+            pattern = u''.join(characterClass(ids) for ids in slots[:length])
+            lookahead = u''.join(characterClass(ids) for ids in slots[length:]) + (u'$' if final else u'')
+            if lookahead:
+                pattern += u'(?=%s)' % lookahead
+            if breakStatus == cls._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+                kind = 'e' if final and len(slots) == 1 else 'n'
+            elif breakStatus == cls._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                kind = 'i'
+            else:
+                kind = 'b'
+            alternatives[kind].append(pattern)
+        for kind in alternatives:
+            alternatives[kind] = u'|'.join(sorted(alternatives[kind]))
+        cls._PATTERN_SYLLABLE = re.compile(u'(?:%(n)s)*(?:(?P<b>%(b)s)|(?P<i>%(i)s)|(?P<e>%(e)s))' % alternatives,
+                                           re.U | re.S)
+
+    def _getSyllableBreakStatus(self, categorys, categorysLen):
+        if categorysLen == 2:
+            letterSequenceTable = MyanmarTokenizer._LETTER_SEQUENCE_TABLE_2ND_CHARACTER
+        elif categorysLen == 3:
+            letterSequenceTable = MyanmarTokenizer._LETTER_SEQUENCE_TABLE_3RD_CHARACTER
+        elif categorysLen == 4:
+            letterSequenceTable = MyanmarTokenizer._LETTER_SEQUENCE_TABLE_4TH_CHARACTER
+        else:
+            letterSequenceTable = None
+        if not letterSequenceTable is None:
+            status = letterSequenceTable.get(categorys[:categorysLen - 1])
+            if not status is None:
+                index = MyanmarTokenizer._LETTER_SEQUENCE_TABLE_INDEX.get(categorys[categorysLen - 1])
+                if not index is None:
+                    return status[index]
+        return MyanmarTokenizer._BREAK_STATUS_UNDEFINED
+
+    def cutRecursively(self, sentence):
+        sentence = utils.toUnicode(sentence)
+        result = ''
+        for i, s in enumerate(self._split(sentence)):
+            if ord(s[0]) < MyanmarTokenizer._MYANMAR_CODES_START \
+                    or ord(s[0]) > MyanmarTokenizer._MYANMAR_CODES_END:
+                if i != 0: result += self.separator
+                result += s + self.separator
+                continue
+            categorys = self.code2Category(s)
+            result += self._syllableSegmentationRecursively('', categorys, '', s)[1]
+        return result
+
+    def cutIteratively(self, sentence):
+        ''' 同cutRecursively（Myanmar部分末尾的separator不去掉），以循环方式运行，不受递归深度限制
+        '''
+        return self._cut(sentence, lambda s: self._syllableSegmentationIteratively(self.code2Category(s), s)[1])
+
+    def _split(self, sentence):
+        for s in MyanmarTokenizer._PATTERN_MYANMAR_CODES.split(sentence):
+            if s is u'':
+                continue
+            yield s
+
+    def cut(self, sentence):
+        if self.stats is not None:
+            return self._cutStats(sentence)
+        return self._cut(sentence, self._segmentationMethod())
+
+    def _segmentationMethod(self):
+        ''' cut对每个Myanmar部分使用的切分方法：LRU缓存 => 磁盘字典 => engine
+        '''
+        if self.cache is not None:
+            return self._syllableSegmentationCached
+        if self.dictionary is not None:
+            return self._syllableSegmentationDictionary
+        return self._engineMethod()
+
+    def _engineMethod(self):
+        ''' 实际切分Myanmar部分的engine（LRU缓存、磁盘字典未命中时也用它），stats=True时经过_syllableSegmentationStats
+        '''
+        if self.stats is not None:
+            return self._syllableSegmentationStats
+        return getattr(self, MyanmarTokenizer._ENGINES[self.engine])
+
+    def _syllableSegmentationStats(self, sentence):
+        ''' stats=True时engine的入口，只在engine真正切分时调用（缓存、磁盘字典命中时不调用）。
+        table engine直接使用这里转换的category id，转换时间记为code2Category；
+        其他engine的转换在engine内部，包含在segmentation里。
+        切分过的Myanmar部分记入_statsRuns，由_cutStats在计时之外统计break status
+        '''
+        engine = getattr(self, MyanmarTokenizer._ENGINES[self.engine])
+        if MyanmarTokenizer._ENGINES[self.engine] == '_syllableSegmentationTable':
+            ts = time.time()
+            ids = self._code2CategoryId(sentence)
+            self.stats['time']['code2Category'] += time.time() - ts
+            self._statsRuns.append(ids)
+            return self._syllableSegmentationTable(sentence, ids)
+        self._statsRuns.append(sentence)
+        return engine(sentence)
+
+    def _cutStats(self, sentence):
+        ''' 同_cut，并记录self.stats：各部分的耗时、Myanmar部分数和字符数、engine切分的各级table确定的break status次数
+        '''
+        stats = self.stats
+        timing = stats['time']
+        syllableSegmentation = self._segmentationMethod()
+        sentence = utils.toUnicode(sentence)
+        ts = time.time()
+        pieces = list(self._split(sentence))
+        timing['split'] += time.time() - ts
+        stats['sentences'] += 1
+        result = ''
+        for i, s in enumerate(pieces):
+            if ord(s[0]) < MyanmarTokenizer._MYANMAR_CODES_START \
+                    or ord(s[0]) > MyanmarTokenizer._MYANMAR_CODES_END:
+                if i != 0: result += self.separator
+                result += s + self.separator
+                continue
+            converted = timing['code2Category']
+            ts = time.time()
+            result += syllableSegmentation(s)
+            timing['segmentation'] += time.time() - ts - (timing['code2Category'] - converted)
+            stats['runs'] += 1
+            stats['characters'] += len(s)
+        for run in self._statsRuns:
+            ids = run if isinstance(run, bytearray) else self._code2CategoryId(run)
+            self._countBreakStatus(ids, stats['breakStatus'])
+        del self._statsRuns[:]
+        return result
+
+    def _countBreakStatus(self, ids, counts):
+        ''' 按_syllableSegmentationTable的步骤，统计每个break status由哪一级table确定
+        :param ids: _code2CategoryId的结果
+        :param counts: [2nd, 3rd, 4th]，每级为break status + 2 => 次数（-2..4）
+        '''
+        bits = MyanmarTokenizer._CATEGORY_ID_BITS
+        tables = (MyanmarTokenizer._BREAK_TABLE_2ND_CHARACTER, MyanmarTokenizer._BREAK_TABLE_3RD_CHARACTER,
+                  MyanmarTokenizer._BREAK_TABLE_4TH_CHARACTER)
+        undefined = MyanmarTokenizer._BREAK_STATUS_UNDEFINED
+        sentenceLen = len(ids)
+        start = 0
+        while start < sentenceLen - 1:
+            context = ids[start]
+            level = 0
+            while True:
+                context = (context << bits) | ids[start + level + 1]
+                breakStatus = tables[level][context]
+                if breakStatus != undefined or level == 2 or start + level + 2 >= sentenceLen:
+                    break
+                level += 1
+            counts[level][breakStatus - undefined] += 1
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                start += 2
+            elif breakStatus <= MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER:
+                start += 1
+            else:
+                start += breakStatus
+
+    def resetStats(self):
+        self._statsRuns = []
+        self.stats = {'sentences': 0, 'runs': 0, 'characters': 0,
+                      'time': {'split': 0.0, 'code2Category': 0.0, 'segmentation': 0.0},
+                      'breakStatus': [[0] * 7 for _ in range(3)]}
+
+    def mergeStats(self, other):
+        ''' 把other（如各线程的tokenizer）记录的stats和LRU缓存的命中次数加到self上
+        '''
+        if self.stats is not None and other.stats is not None:
+            for key in ('sentences', 'runs', 'characters'):
+                self.stats[key] += other.stats[key]
+            for key, value in other.stats['time'].iteritems():
+                self.stats['time'][key] += value
+            for counts, otherCounts in zip(self.stats['breakStatus'], other.stats['breakStatus']):
+                for i, count in enumerate(otherCounts):
+                    counts[i] += count
+        if self.cache is not None and other.cache is not None:
+            self.cache.hits += other.cache.hits
+            self.cache.misses += other.cache.misses
+            self.cache.evictions += other.cache.evictions
+
+    def getStats(self):
+        ''' stats=True时cut记录的统计
+        :return: {'sentences', 'runs', 'characters',
+                  'time': {'split', 'code2Category', 'segmentation'}（秒，engine内部的category转换包含在segmentation里）,
+                  'breakStatus': {'2nd'|'3rd'|'4th': {break status: 次数}}（只统计engine切分的，缓存、磁盘字典命中的不计）,
+                  'cache': cacheInfo()}，未启用时返回None
+        '''
+        if self.stats is None:
+            return None
+        stats = dict(self.stats)
+        stats['time'] = dict(self.stats['time'])
+        stats['breakStatus'] = dict((level, dict((status + MyanmarTokenizer._BREAK_STATUS_UNDEFINED, count)
+                                                 for status, count in enumerate(counts)))
+                                    for level, counts in zip(('2nd', '3rd', '4th'), self.stats['breakStatus']))
+        stats['cache'] = self.cacheInfo()
+        return stats
+
+    def cacheInfo(self):
+        ''' cut的LRU缓存状态
+        :return: {'hits', 'misses', 'evictions', 'size', 'maxSize'}，未启用缓存时返回None
+        '''
+        if self.cache is None:
+            return None
+        return self.cache.info()
+
+    def cutDFA(self, sentence):
+        ''' 同cut，固定使用dfa engine
+        '''
+        return self._cut(sentence, self._syllableSegmentationDFA)
+
+    def iterCutRegex(self, sentence):
+        ''' 同cut，固定使用regex engine，以generator方式依次返回结果片段，''.join后与cut的结果一致
+        '''
+        sentence = utils.toUnicode(sentence)
+        for i, s in enumerate(self._split(sentence)):
+            if ord(s[0]) < MyanmarTokenizer._MYANMAR_CODES_START \
+                    or ord(s[0]) > MyanmarTokenizer._MYANMAR_CODES_END:
+                if i != 0: yield self.separator
+                yield s + self.separator
+                continue
+            for result in self._iterSyllableSegmentationRegex(s):
+                yield result
+
+    def _cut(self, sentence, syllableSegmentation):
+        sentence = utils.toUnicode(sentence)
+        result = ''
+        for i, s in enumerate(self._split(sentence)):
+            if ord(s[0]) < MyanmarTokenizer._MYANMAR_CODES_START \
+                    or ord(s[0]) > MyanmarTokenizer._MYANMAR_CODES_END:
+                if i != 0: result += self.separator
+                result += s + self.separator
+                continue
+            result += syllableSegmentation(s)
+        return result
+
+    def boundaries(self, sentence):
+        ''' 返回每个音节（以及每段非Myanmar字符）的起始位置，与cut的切分一致，
+        但不生成categorys字符串和结果字符串；'?'标记不产生边界。stats=True时同cut一样记录stats
+        :param sentence:
+        :return: array('I')
+        '''
+        sentence = utils.toUnicode(sentence)
+        result = array('I')
+        illegal = MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER
+        stats = self.stats
+        runs = []
+        ts = time.time()
+        end = 0
+        for match in MyanmarTokenizer._PATTERN_MYANMAR_CODES.finditer(sentence):
+            start = match.start()
+            if start > end:
+                result.append(end)
+            end = match.end()
+            result.append(start)
+            if stats is not None:
+                runs.append(match.group())
+            for index, breakStatus in self._syllableMarksDFA(match.group()):
+                if breakStatus != illegal and start + index + 1 < end:
+                    result.append(start + index + 1)
+        if len(sentence) > end:
+            result.append(end)
+        if stats is not None:
+            # 与_cutStats一样记录，查找Myanmar部分和DFA切分都计入segmentation
+            stats['time']['segmentation'] += time.time() - ts
+            stats['sentences'] += 1
+            stats['runs'] += len(runs)
+            for run in runs:
+                stats['characters'] += len(run)
+                self._countBreakStatus(self._code2CategoryId(run), stats['breakStatus'])
+        return result
+
+    def syllables(self, sentence):
+        ''' 依次返回每个音节（以及每段非Myanmar字符），见boundaries
+        '''
+        sentence = utils.toUnicode(sentence)
+        boundaries = self.boundaries(sentence)
+        for i in range(len(boundaries) - 1):
+            yield sentence[boundaries[i]:boundaries[i + 1]]
+        if boundaries:
+            yield sentence[boundaries[-1]:]
+
+    def _tokens(self, sentence):
+        ''' 音节，非Myanmar部分按空白分开并去掉空白
+        '''
+        return [token for syllable in self.syllables(sentence) for token in syllable.split()]
+
+    def words(self, sentence, method='mm'):
+        ''' 在音节的基础上按lexicon切词，lexicon里没有的音节单独成词
+        :param sentence:
+        :param method: mm: 正向最大匹配; dag: 按词频取概率最大的切分
+        :return: [word, ...]
+        '''
+        tokens = self._tokens(sentence)
+        codes = self.lexicon.encode(tokens)
+        if method == 'mm':
+            ends = self._matchMaximum(codes)
+        elif method == 'dag':
+            ends = self._matchDAG(codes)
+        else:
+            raise ValueError('unknown method: %s' % method)
+        result = []
+        start = 0
+        for end in ends:
+            result.append(u''.join(tokens[start:end]))
+            start = end
+        return result
+
+    def cutWords(self, sentence, method='mm'):
+        return self.separator.join(self.words(sentence, method))
+
+    def _matchMaximum(self, codes):
+        ''' 正向最大匹配
+        :return: 每个词的结束位置
+        '''
+        ends = []
+        start = 0
+        while start < len(codes):
+            prefixes = self.lexicon.prefixes(codes, start)
+            start = prefixes[-1][0] if prefixes else start + 1
+            ends.append(start)
+        return ends
+
+    def _matchDAG(self, codes):
+        ''' 每个位置开始的所有词构成DAG，从右往左动态规划求log概率之和最大的路径，
+        lexicon里没有的音节按词频1计算
+        :return: 每个词的结束位置
+        '''
+        import math
+        logTotal = math.log(max(self.lexicon.total, 1))
+        codesLen = len(codes)
+        route = [0.0] * (codesLen + 1)
+        nexts = [0] * codesLen
+        for start in xrange(codesLen - 1, -1, -1):
+            best, bestEnd = route[start + 1] - logTotal, start + 1
+            for end, value in self.lexicon.prefixes(codes, start):
+                score = math.log(value) - logTotal + route[end]
+                if score >= best:
+                    best, bestEnd = score, end
+            route[start] = best
+            nexts[start] = bestEnd
+        ends = []
+        start = 0
+        while start < codesLen:
+            start = nexts[start]
+            ends.append(start)
+        return ends
+
+    def buildLexicon(self, inputPath, outputPath, coding='utf8'):
+        ''' 把词表编译成words使用的double-array trie
+        :param inputPath: 每行为 词 [词频]，词频默认为1
+        :param outputPath:
+        :param coding: 词表编码
+        :return: 词数
+        '''
+        from trie import DoubleArrayTrie
+
+        def items():
+            with codecs.open(inputPath, 'r', coding) as fp:
+                for line in fp:
+                    fields = line.split()
+                    if not fields:
+                        continue
+                    freq = int(fields[1]) if len(fields) > 1 else 1
+                    tokens = self._tokens(fields[0])
+                    if tokens and freq > 0:
+                        yield tokens, freq
+        return DoubleArrayTrie.build(outputPath, items())
+
+    def cutMany(self, lines):
+        ''' 批量切分，返回每行的音节列表，与[list(syllables(line)) for line in lines]一致
+        所有行拼成一个buffer（以换行分隔），只解码一次、扫描一次_PATTERN_MYANMAR_CODES，
+        再按每行在buffer里的起止位置从boundaries取音节
+        :param lines: iterable of sentences
+        :return: [[syllable, ...], ...]
+        '''
+        lines = list(lines)
+        buffer = None
+        if lines and all(isinstance(line, str) for line in lines):
+            buffer = utils.toUnicode('\n'.join(lines))
+            if buffer.count(u'\n') != len(lines) - 1:
+                buffer = None  # 行内有换行，无法从buffer确定每行的位置
+        if buffer is None:
+            texts = [utils.toUnicode(line) for line in lines]
+            buffer = u'\n'.join(texts)
+            ends = []
+            end = -1
+            for text in texts:
+                end += 1 + len(text)
+                ends.append(end)
+        else:
+            ends = []
+            end = -1
+            for _ in range(len(lines) - 1):
+                end = buffer.index(u'\n', end + 1)
+                ends.append(end)
+            ends.append(len(buffer))
+
+        boundaries = self.boundaries(buffer)
+        boundariesLen = len(boundaries)
+        result = []
+        i = 0
+        start = 0
+        for end in ends:
+            # 行首一定是边界，之前的边界属于上一行或分隔的换行
+            while i < boundariesLen and boundaries[i] <= start:
+                i += 1
+            syllables = []
+            while i < boundariesLen and boundaries[i] < end:
+                syllables.append(buffer[start:boundaries[i]])
+                start = boundaries[i]
+                i += 1
+            if end > start:
+                syllables.append(buffer[start:end])
+            result.append(syllables)
+            start = end + 1
+        return result
+
+    def cutText(self, text):
+        ''' 切分多行文本，与u'\\n'.join(cut(line) for line in text.split(u'\\n'))一致
+        engine为numpy时整个text一次向量化处理，否则逐行cut
+        '''
+        text = utils.toUnicode(text)
+        if self.engine == 'numpy':
+            return self._cutNumpy(text, True)
+        return u'\n'.join(self.cut(line) for line in text.split(u'\n'))
+
+    def cutLines(self, lines):
+        ''' 切分若干行，返回每行cut(line.strip()) + os.linesep连在一起的结果
+        engine为numpy时所有行拼起来用cutText一次向量化处理，不逐个Myanmar部分调用numpy
+        （启用了LRU缓存、磁盘字典或stats时仍逐行cut）
+        :param lines: [unicode, ...]
+        :return: unicode
+        '''
+        if not lines:
+            return u''
+        if self.engine == 'numpy' and self.cache is None and self.dictionary is None and self.stats is None:
+            result = self.cutText(u'\n'.join(utils.toUnicode(line).strip() for line in lines))
+            return result.replace(u'\n', os.linesep) + os.linesep
+        return u''.join(self.cut(line.strip()) + os.linesep for line in lines)
+
+    def cutStd(self, stdin, stdout):
+        if self.engine == 'numpy':
+            # 按块交给cutLines（启用磁盘字典、LRU缓存或stats时它仍逐行cut）
+            import itertools
+            while True:
+                lines = list(itertools.islice(stdin, MyanmarTokenizer._NUMPY_BLOCK_LINES))
+                if not lines:
+                    break
+                stdout.write(self.cutLines(lines))
+            return
+        for line in stdin:
+            result = self.cut(line.strip())
+            stdout.write(result+os.linesep)
+
+    def cutIds(self, stdin, stdout, vocabulary, batchLines=10000):
+        ''' 同cutStd，但每行输出音节id（见python_utils.vocab），不需要再把结果分开、查词表
+        非Myanmar部分按空白分成token
+        :param stdin: 按行返回unicode的输入
+        :param stdout: 二进制输出流
+        :param vocabulary: vocab.Vocabulary
+        :param batchLines: 每次用cutMany切分的行数
+        '''
+        import vocab
+        import itertools
+        while True:
+            lines = [line.strip() for line in itertools.islice(stdin, batchLines)]
+            if not lines:
+                break
+            for syllables in self.cutMany(lines):
+                vocab.writeIds(stdout, vocabulary.encode([token for syllable in syllables for token in syllable.split()]))
+
+    def cutStream(self, stdin, stdout, coding='utf8', bufferSize=1024 * 1024):
+        ''' 同cutStd，但按块读写二进制流：每次读bufferSize字节并增量解码，切分其中完整的行，
+        结果累积到bufferSize后编码成utf8一次写出。
+        超过bufferSize的行在Myanmar字符内可以切开的位置分段切分（见_splitLongLine），
+        所以内存占用与行长无关（没有Myanmar字符的长行除外）
+        :param stdin: 二进制输入流
+        :param stdout: 二进制输出流
+        :param coding: 输入编码
+        :param bufferSize: 读写缓冲区大小（字节）
+        '''
+        decoder = codecs.getincrementaldecoder(coding)()
+        pending = u''
+        result = []
+        resultSize = 0
+        while True:
+            block = stdin.read(bufferSize)
+            lines = (pending + decoder.decode(block, not block)).splitlines(True)
+            pending = u''
+            if block and lines and (lines[-1].splitlines()[0] == lines[-1] or lines[-1].endswith(u'\r')):
+                pending = lines.pop()  # 不完整的行；'\r'后面可能还有'\n'
+            if lines:
+                result.append(self.cutLines(lines))
+                resultSize += len(result[-1])
+            if len(pending) > bufferSize:
+                index, joiner = self._splitLongLine(pending)
+                if joiner is not None:
+                    result.append(self.cut(pending[:index].strip()) + joiner)
+                    resultSize += len(result[-1])
+                    pending = pending[index:]
+            if resultSize >= bufferSize or not block:
+                stdout.write(u''.join(result).encode('utf8'))
+                result = []
+                resultSize = 0
+            if not block:
+                break
+
+    def _splitLongLine(self, line):
+        ''' 在line最后一段Myanmar字符内找一个可以切开的位置index：
+        DFA读完line[index - 1]后回到初始状态（之前的break status都已确定，与后面的字符无关），且line[index]还是Myanmar字符，
+        此时cut(line) == cut(line[:index]) + joiner + cut(line[index:])
+        :param line: unicode
+        :return: (index, joiner)，找不到时返回(0, None)
+        '''
+        match = None
+        for match in MyanmarTokenizer._PATTERN_MYANMAR_CODES.finditer(line):
+            pass
+        if match is None:
+            return 0, None
+        bits = MyanmarTokenizer._CATEGORY_ID_BITS
+        dfa = MyanmarTokenizer._dfa()
+        transitions = dfa['transitions']
+        dfaMarks = dfa['marks']
+
+        index, joiner = 0, None
+        state = 0
+        for i, id in enumerate(self._code2CategoryId(match.group())):
+            key = (state << bits) | id
+            state = transitions[key]
+            if state == 0 and match.start() + i + 1 < match.end():
+                # 回到初始状态时当前字符后一定有标记：separator会被cut去掉，'?'会保留
+                index = match.start() + i + 1
+                if dfaMarks[key][-1][1] == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                    joiner = ''
+                else:
+                    joiner = self.separator
+        return index, joiner
+
+    def cutCategory(self, categorys):
+        result = self._syllableSegmentationIteratively(categorys, categorys)
+        return result[0]
+
+    def _syllableSegmentation(self, categorys, sentence):
+        ''' 对Myanmar分词
+        :param categorys: sentence通过code2Category转换后的结果
+        :param sentence: Myanmar sentence...
+        :return : [categorys segmentations, sentence segmentations]
+        '''
+        result = ["", ""]
+        residueLen = sentenceLen = len(categorys)
+        start = 0
+        while not residueLen is 0:
+            if residueLen is 1:
+                return [result[0] + categorys[-1], result[1] + sentence[-1]]
+            # if categorys[start] is '?':
+            #     # invalid categorys
+            #     categorysLeft = categorys[start]
+            #     sentenceLeft = sentence[start]
+            #     start += 1
+            #     result[0] += categorysLeft
+            #     result[1] += sentenceLeft
+            #     residueLen = sentenceLen - start
+            #     continue
+
+            # 先2nd
+            breakStatus = self._getSyllableBreakStatus(categorys[start:start + 2], 2)
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and residueLen >= 3:  # undefined cases
+                breakStatus = self._getSyllableBreakStatus(categorys[start:start + 3], 3)
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and residueLen >= 4:
+                breakStatus = self._getSyllableBreakStatus(categorys[start:start + 4], 4)
+
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED:
+                categorysLeft = categorys[start] + self.separator
+                sentenceLeft = sentence[start] + self.separator
+                start += 1
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                # L = L + X1X2?;    R = X3X4...Xn ;
+                categorysLeft = categorys[start:start + 2] + '?'
+                sentenceLeft = sentence[start:start + 2] + '?'
+                start += 2
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+                # L = L + X1 ;   R = X2X3 ...Xn ;
+                categorysLeft = categorys[start]
+                sentenceLeft = sentence[start]
+                start += 1
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER:  # Break after 1 st character
+                # L = L + X1B;   R = X2X3 ...Xn ;
+                categorysLeft = categorys[start] + self.separator
+                sentenceLeft = sentence[start] + self.separator
+                start += 1
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_2ND_CHARACTER:  # Break after 2 nd character
+                # L = L + X1X2B;   R = X3X4 ...Xn ;
+                categorysLeft = categorys[start:start + 2] + self.separator
+                sentenceLeft = sentence[start:start + 2] + self.separator
+                start += 2
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_3RD_CHARACTER:  # Break after 3 rd character
+                # L = L + X1X2X3B;   R = X4X5 ...Xn ;
+                categorysLeft = categorys[start:start + 3] + self.separator
+                sentenceLeft = sentence[start:start + 3] + self.separator
+                start += 3
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_4TH_CHARACTER:  # Break after 4 th character
+                # L = L + X1X2X3X4B;  R = X5X6 ...Xn ;
+                categorysLeft = categorys[start:start + 4] + self.separator
+                sentenceLeft = sentence[start:start + 4] + self.separator
+                start += 4
+            result[0] += categorysLeft
+            result[1] += sentenceLeft
+            residueLen = sentenceLen - start
+
+        return (result[0].rstrip(self.separator), result[1].rstrip(self.separator))
+
+    def _syllableSegmentationRule(self, sentence):
+        ''' rule engine：先code2Category，再_syllableSegmentation
+        :param sentence: Myanmar sentence...
+        :return : sentence segmentations
+        '''
+        return self._syllableSegmentation(self.code2Category(sentence), sentence)[1]
+
+    def _syllableSegmentationCached(self, sentence):
+        ''' 先查LRU缓存，未命中时用engine切分并放入缓存；separator可能被修改，所以也作为key的一部分
+        '''
+        key = (self.separator, sentence)
+        result = self.cache.get(key)
+        if result is None:
+            if self.dictionary is not None:
+                result = self._syllableSegmentationDictionary(sentence)
+            else:
+                result = self._engineMethod()(sentence)
+            self.cache.put(key, result)
+        return result
+
+    def _syllableSegmentationDictionary(self, sentence):
+        ''' 先在磁盘字典里查找各音节长度，未找到时用engine切分，
+        结果可以还原成各音节长度时（没有'?'，sentence里也没有separator）记入newRuns
+        '''
+        lengths = self.dictionary.get(sentence)
+        if lengths is not None:
+            result = []
+            start = 0
+            for length in lengths:
+                result.append(sentence[start:start + length])
+                start += length
+            return self.separator.join(result)
+        result = self._engineMethod()(sentence)
+        if self.separator:
+            syllables = result.split(self.separator)
+            if all(syllables) and u''.join(syllables) == sentence:
+                self.newRuns[sentence] = [len(syllable) for syllable in syllables]
+                if len(self.newRuns) >= MyanmarTokenizer._NEW_RUNS_LIMIT:
+                    self._spillNewRuns()
+        return result
+
+    def _spillNewRuns(self):
+        ''' 把newRuns排序写到磁盘字典所在目录的临时文件（DiskDict格式）并清空，saveDictionary时归并
+        '''
+        import tempfile
+        from diskdict import DiskDict
+        fd, path = tempfile.mkstemp(suffix='.newruns', dir=os.path.dirname(os.path.abspath(self.dictionary.path)))
+        os.close(fd)
+        DiskDict.write(path, sorted((key.encode('utf8'), value) for key, value in self.newRuns.iteritems()))
+        self.newRunsSpills.append(path)
+        self.newRuns = {}
+
+    def takeNewRuns(self):
+        ''' 返回并清空newRuns和写出的临时文件，worker进程用来把新的Myanmar部分交给主进程
+        :return: (newRuns, [临时文件, ...])
+        '''
+        newRuns, spills = self.newRuns, self.newRunsSpills
+        self.newRuns = {}
+        self.newRunsSpills = []
+        return newRuns, spills
+
+    def addNewRuns(self, newRuns, spills=()):
+        ''' 收集其他tokenizer（worker）的takeNewRuns，超过_NEW_RUNS_LIMIT时写到临时文件
+        '''
+        self.newRuns.update(newRuns)
+        self.newRunsSpills.extend(spills)
+        if self.dictionary is not None and len(self.newRuns) >= MyanmarTokenizer._NEW_RUNS_LIMIT:
+            self._spillNewRuns()
+
+    def saveDictionary(self, newRuns=None):
+        ''' 把newRuns（以及其他worker的newRuns）和写出的临时文件合并进磁盘字典并重新打开
+        :param newRuns: {Myanmar部分: [音节长度, ...]}
+        :return: 字典的项数
+        '''
+        if newRuns:
+            self.addNewRuns(newRuns)
+        path = self.dictionary.path
+        self.dictionary.close()
+        from diskdict import DiskDict
+        newRuns, spills = self.takeNewRuns()
+        try:
+            count = DiskDict.merge(path, newRuns, spills)
+        finally:
+            for spill in spills:
+                os.remove(spill)
+        self.dictionary = DiskDict(path)
+        return count
+
+    def _syllableSegmentationTable(self, sentence, ids=None):
+        ''' table engine：同_syllableSegmentation，但每个break status只需查编译后的扁平数组，
+        不生成categorys字符串，也不对categorys切片
+        :param sentence: Myanmar sentence...
+        :param ids: 已转换的_code2CategoryId(sentence)
+        :return : sentence segmentations
+        '''
+        bits = MyanmarTokenizer._CATEGORY_ID_BITS
+        table2 = MyanmarTokenizer._BREAK_TABLE_2ND_CHARACTER
+        table3 = MyanmarTokenizer._BREAK_TABLE_3RD_CHARACTER
+        table4 = MyanmarTokenizer._BREAK_TABLE_4TH_CHARACTER
+        undefined = MyanmarTokenizer._BREAK_STATUS_UNDEFINED
+        separator = self.separator
+
+        if ids is None:
+            ids = self._code2CategoryId(sentence)
+        result = []
+        sentenceLen = len(ids)
+        start = 0
+        while start < sentenceLen - 1:
+            # 先2nd
+            context = (ids[start] << bits) | ids[start + 1]
+            breakStatus = table2[context]
+            if breakStatus == undefined and start + 2 < sentenceLen:
+                context = (context << bits) | ids[start + 2]
+                breakStatus = table3[context]
+                if breakStatus == undefined and start + 3 < sentenceLen:
+                    breakStatus = table4[(context << bits) | ids[start + 3]]
+
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+                result.append(sentence[start])
+                start += 1
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER or breakStatus == undefined:
+                result.append(sentence[start])
+                result.append(separator)
+                start += 1
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                result.append(sentence[start:start + 2])
+                result.append('?')
+                start += 2
+            else:  # Break after 2nd, 3rd, 4th character
+                result.append(sentence[start:start + breakStatus])
+                result.append(separator)
+                start += breakStatus
+        # 同_syllableSegmentation：剩1个字符时直接返回，否则去掉末尾的separator
+        if start == sentenceLen - 1:
+            result.append(sentence[start])
+            return ''.join(result)
+        return ''.join(result).rstrip(separator)
+
+    def _syllableSegmentationDFA(self, sentence):
+        ''' dfa engine：见_syllableMarksDFA
+        :param sentence: Myanmar sentence...
+        :return : sentence segmentations
+        '''
+        return self._joinMarks(sentence, self._syllableMarksDFA(sentence))
+
+    def _syllableMarksDFA(self, sentence):
+        ''' 每个字符查一次_DFA的状态转移，得到需要插入标记的位置
+        :param sentence: Myanmar sentence...
+        :return : [(index of sentence, break status), ...]，break status为-1时标记为'?'，否则为separator
+        '''
+        bits = MyanmarTokenizer._CATEGORY_ID_BITS
+        dfa = MyanmarTokenizer._dfa()
+        transitions = dfa['transitions']
+        dfaMarks = dfa['marks']
+
+        marks = []
+        state = 0
+        for i, id in enumerate(self._code2CategoryId(sentence)):
+            key = (state << bits) | id
+            state = transitions[key]
+            for distance, breakStatus in dfaMarks[key]:
+                marks.append((i - distance, breakStatus))
+        last = len(sentence) - 1
+        for distance, breakStatus in dfa['finals'][state]:
+            marks.append((last - distance, breakStatus))
+        return marks
+
+    def _syllableSegmentationRegex(self, sentence):
+        ''' regex engine：见_iterSyllableSegmentationRegex
+        :param sentence: Myanmar sentence...
+        :return : sentence segmentations
+        '''
+        return ''.join(self._iterSyllableSegmentationRegex(sentence))
+
+    def _iterSyllableSegmentationRegex(self, sentence):
+        ''' 用_PATTERN_SYLLABLE.finditer扫描，依次返回结果片段
+        :param sentence: Myanmar sentence...
+        :return : generator of sentence segmentations
+        '''
+        separator = self.separator
+        result = None
+        for match in MyanmarTokenizer._syllablePattern().finditer(sentence):
+            if result is not None:
+                yield result
+            kind = match.lastgroup
+            if kind == 'b':
+                result = match.group() + separator
+            elif kind == 'i':
+                result = match.group() + '?'
+            else:
+                result = match.group()
+        if result is not None:
+            # 同_syllableSegmentation：最后一个字符后有标记时去掉末尾的separator
+            yield result if kind == 'e' else result.rstrip(separator)
+
+    def _syllableSegmentationNumpy(self, sentence):
+        ''' numpy engine：见_cutNumpy，逐个Myanmar sentence调用时numpy的开销较大，大文本用cutText
+        :param sentence: Myanmar sentence...
+        :return : sentence segmentations
+        '''
+        return self._cutNumpy(sentence, False)
+
+    @classmethod
+    def _numpyTables(cls):
+        ''' numpy engine用的数组：Myanmar字符（减去_MYANMAR_CODES_START）=> category id，以及2nd、3rd、4th table
+        '''
+        import numpy
+        if cls._NUMPY_TABLES is None:
+            categoryIds = numpy.array([ord(unichr(code).translate(cls._CATEGORY_ID_TABLE))
+                                       for code in range(cls._MYANMAR_CODES_START, cls._MYANMAR_CODES_END + 1)],
+                                      dtype=numpy.uint8)
+            cls._NUMPY_TABLES = (categoryIds,
+                                 numpy.array(cls._BREAK_TABLE_2ND_CHARACTER, dtype=numpy.int8),
+                                 numpy.array(cls._BREAK_TABLE_3RD_CHARACTER, dtype=numpy.int8),
+                                 numpy.array(cls._BREAK_TABLE_4TH_CHARACTER, dtype=numpy.int8))
+        return cls._NUMPY_TABLES
+
+    def _cutNumpy(self, text, lineBreak):
+        ''' 用numpy向量化切分：整个text转成category id数组，一次查表得到每对相邻字符的2nd break status，
+        只对undefined的位置再查3rd、4th table；只有一次确定多个字符的位置需要按顺序检查是否被前面跳过
+        :param text: unicode
+        :param lineBreak: True时u'\\n'作为行的分隔（每行分别按cut处理），False时与cut(text)一致
+        :return: 切分结果
+        '''
+        import numpy
+        categoryIds, table2, table3, table4 = MyanmarTokenizer._numpyTables()
+        bits = MyanmarTokenizer._CATEGORY_ID_BITS
+        undefined = MyanmarTokenizer._BREAK_STATUS_UNDEFINED
+        illegal = MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER
+        textLen = len(text)
+        if textLen == 0:
+            return text
+
+        codes = numpy.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+        myanmar = (codes >= MyanmarTokenizer._MYANMAR_CODES_START) & (codes <= MyanmarTokenizer._MYANMAR_CODES_END)
+        ids = numpy.empty(textLen + 3, dtype=numpy.int32)
+        ids.fill(MyanmarTokenizer._CATEGORY_ID_UNKNOWN)
+        ids[:textLen][myanmar] = categoryIds[codes[myanmar] - MyanmarTokenizer._MYANMAR_CODES_START]
+        inRun = numpy.zeros(textLen + 3, dtype=bool)
+        inRun[:textLen] = myanmar
+
+        # 每个位置的break status，residue为该位置到Myanmar部分结尾的字符数
+        residue2 = inRun[:textLen] & inRun[1:textLen + 1]
+        residue3 = residue2 & inRun[2:textLen + 2]
+        residue4 = residue3 & inRun[3:textLen + 3]
+        context = (ids[:textLen] << bits) | ids[1:textLen + 1]
+        breakStatus = table2[context]
+        context = (context << bits) | ids[2:textLen + 2]
+        breakStatus = numpy.where((breakStatus == undefined) & residue3, table3[context], breakStatus)
+        context = (context << bits) | ids[3:textLen + 3]
+        breakStatus = numpy.where((breakStatus == undefined) & residue4, table4[context], breakStatus)
+        breakStatus[breakStatus == undefined] = MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER
+        length = numpy.where(breakStatus == illegal, 2, numpy.maximum(breakStatus, 1))
+
+        # 一次确定多个字符的位置：按顺序检查是否已被前面的位置跳过
+        landed = residue2.copy()
+        covered = 0
+        starts = []
+        for start in numpy.flatnonzero(residue2 & (length > 1)).tolist():
+            if start >= covered:
+                covered = start + length[start]
+                starts.append(start)
+        starts = numpy.array(starts, dtype=numpy.intp)
+        for skip in range(1, 4):
+            skipped = starts[length[starts] > skip]
+            landed[skipped + skip] = False
+
+        # 插入标记：'?'在separator之前；Myanmar部分结尾的separator被去掉，后面是非Myanmar字符时再加上
+        separatorCodes = numpy.frombuffer(unicode(self.separator).encode('utf-32-le'), dtype='<u4')
+        starts = numpy.flatnonzero(landed & (breakStatus != MyanmarTokenizer._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER))
+        isIllegal = breakStatus[starts] == illegal
+        illegalAt = starts[isIllegal] + 1
+        separatorAt = starts[~isIllegal] + length[starts[~isIllegal]] - 1
+        runEnd = myanmar & ~inRun[1:textLen + 1]
+        separatorAt = separatorAt[~runEnd[separatorAt]]
+        other = ~myanmar
+        if lineBreak:
+            other &= codes != ord(u'\n')
+        following = numpy.zeros(textLen, dtype=bool)
+        following[:-1] = other[1:]
+        otherEnd = other & ~following
+        separatorAt = numpy.union1d(separatorAt, numpy.flatnonzero((runEnd & following) | otherEnd))
+
+        index = numpy.concatenate([illegalAt + 1, numpy.repeat(separatorAt + 1, len(separatorCodes))])
+        values = numpy.concatenate([numpy.repeat(numpy.array([ord(u'?')], dtype='<u4'), len(illegalAt)),
+                                    numpy.tile(separatorCodes, len(separatorAt))])
+        return numpy.insert(codes, index, values).tobytes().decode('utf-32-le')
+
+    def _joinMarks(self, sentence, marks):
+        ''' 按标记位置拼接结果，与_syllableSegmentation的结果一致
+        :param sentence: Myanmar sentence...
+        :param marks: [(index of sentence, break status), ...]，按index排序，break status为-1时标记为'?'
+        :return : sentence segmentations
+        '''
+        result = []
+        start = 0
+        for index, breakStatus in marks:
+            result.append(sentence[start:index + 1])
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                result.append('?')
+            else:
+                result.append(self.separator)
+            start = index + 1
+        result.append(sentence[start:])
+        # 最后一个字符后有标记时_syllableSegmentation会去掉末尾的separator
+        if marks and marks[-1][0] == len(sentence) - 1:
+            return ''.join(result).rstrip(self.separator)
+        return ''.join(result)
+
+    def _syllableSegmentationIteratively(self, categorys, sentence):
+        ''' 同_syllableSegmentationRecursively('', categorys, '', sentence)，以循环方式运行，
+        时间与长度成线性关系，也不会超过递归深度限制
+        :param categorys: sentence通过code2Category转换后的结果
+        :param sentence: Myanmar sentence...
+        :return: [categorys segmentations, sentence segmentations]
+        '''
+        categorysLeft = []
+        sentenceLeft = []
+        sentenceLen = len(categorys)
+        start = 0
+        while sentenceLen - start >= 2:
+            # 先2nd
+            breakStatus = self._getSyllableBreakStatus(categorys[start:start + 2], 2)
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and sentenceLen - start >= 3:
+                breakStatus = self._getSyllableBreakStatus(categorys[start:start + 3], 3)
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and sentenceLen - start >= 4:
+                breakStatus = self._getSyllableBreakStatus(categorys[start:start + 4], 4)
+
+            if breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+                # L = L + X1X2?;    R = X3X4...Xn ;
+                length, mark = 2, '?'
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+                # L = L + X1 ;   R = X2X3 ...Xn ;
+                length, mark = 1, ''
+            elif breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED \
+                    or breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER:
+                # L = L + X1B;   R = X2X3 ...Xn ;
+                length, mark = 1, self.separator
+            else:  # Break after 2nd, 3rd, 4th character
+                # L = L + X1...XkB;   R = Xk+1 ...Xn ;
+                length, mark = breakStatus, self.separator
+            categorysLeft.append(categorys[start:start + length] + mark)
+            sentenceLeft.append(sentence[start:start + length] + mark)
+            start += length
+        categorysLeft.append(categorys[start:])
+        sentenceLeft.append(sentence[start:])
+        return (''.join(categorysLeft), ''.join(sentenceLeft))
+
+    def _syllableSegmentationRecursively(self, categorysLeft, categorysRight, sentenceLeft, sentenceRight):
+        ''' 同_syllableSegmentation， 以递归方式运行
+        :param categorysLeft: categorys返回结果
+        :param categorysRight: categorys未处理字符串
+        :param sentenceLeft: sentenceLeft返回结果
+        :param sentenceRight: sentenceRight未处理字符串
+        :return: [categorys segmentations, sentence segmentations]
+        '''
+        rightLen = len(categorysRight)
+        if rightLen is 0:
+            return (categorysLeft, sentenceLeft)
+        if rightLen is 1:
+            return (categorysLeft + categorysRight, sentenceLeft + sentenceRight)
+        # 先2nd
+        breakStatus = self._getSyllableBreakStatus(categorysRight[:2], 2)
+        if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and rightLen >= 3:  # undefined cases
+            breakStatus = self._getSyllableBreakStatus(categorysRight[:3], 3)
+        if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED and rightLen >= 4:
+            breakStatus = self._getSyllableBreakStatus(categorysRight[:4], 4)
+        if breakStatus == MyanmarTokenizer._BREAK_STATUS_UNDEFINED:
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[0] + self.separator,
+                                                         categorysRight[1:],
+                                                         sentenceLeft + sentenceRight[0] + self.separator,
+                                                         sentenceRight[1:])
+
+        if breakStatus == MyanmarTokenizer._BREAK_STATUS_ILLEGAL_SPELLING_ORDER:
+            # L = L + X1X2?;    R = X3X4...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[:2] + '?', categorysRight[2:],
+                                                         sentenceLeft + sentenceRight[:2] + '?', sentenceRight[2:])
+        elif breakStatus == MyanmarTokenizer._BREAK_STATUS_NO_BREAK_AFTER_1ST_CHARACTER:
+            # L = L + X1 ;   R = X2X3 ...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[0], categorysRight[1:],
+                                                         sentenceLeft + sentenceRight[0], sentenceRight[1:])
+        elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_1ST_CHARACTER:  # Break after 1 st character
+            # L = L + X1B;   R = X2X3 ...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[0] + self.separator,
+                                                         categorysRight[1:],
+                                                         sentenceLeft + sentenceRight[0] + self.separator,
+                                                         sentenceRight[1:])
+        elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_2ND_CHARACTER:  # Break after 2 nd character
+            # L = L + X1X2B;   R = X3X4 ...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[:2] + self.separator,
+                                                         categorysRight[2:],
+                                                         sentenceLeft + sentenceRight[:2] + self.separator,
+                                                         sentenceRight[2:])
+        elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_3RD_CHARACTER:  # Break after 3 rd character
+            # L = L + X1X2X3B;   R = X4X5 ...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[:3] + self.separator,
+                                                         categorysRight[3:],
+                                                         sentenceLeft + sentenceRight[:3] + self.separator,
+                                                         sentenceRight[3:])
+        elif breakStatus == MyanmarTokenizer._BREAK_STATUS_BREAK_AFTER_4TH_CHARACTER:  # Break after 4 th character
+            # L = L + X1X2X3X4B;  R = X5X6 ...Xn ;
+            return self._syllableSegmentationRecursively(categorysLeft + categorysRight[:4] + self.separator,
+                                                         categorysRight[4:],
+                                                         sentenceLeft + sentenceRight[:4] + self.separator,
+                                                         sentenceRight[4:])
+
+
+MyanmarTokenizer._compileLetterSequenceTables()
+
+
+# category序列 => 切分结果，test和compareEngines使用
+_TEST_CASES = [('CCSCCSCCCCCA', '|CCSCCSC|C|C|CCA|'),
+               ('ECSCCCCACMCAFCCAF', '|ECSC|C|CCA|CMCAF|CCAF|'),
+               ('ECSCVCC', '|ECSCV|C|C|'),
+               ('ICCVCA', '|I|C|CVCA|'),
+               ('CCASCCSCCVCA', '|CCASCCSC|CVCA|'),
+               ('CVFCACMVVCA', '|CVFCA|CMVVCA|'),
+               ('CCVGVC', '|C|CVGV|C|'),
+               ('CVCCVFCV', '|CV|C|CVF|CV|'),
+               ('CMMCAVCAICAF', '|CMMCAVCA|I|CAF|'),
+               ('CCACMACVFCVF', '|CCACMA|CVF|CVF|'),
+               ('CSCCACCACVVCA', '|CSCCA|CCA|CVVCA|'),
+               ]
+
+
+def test():
+    cases = _TEST_CASES
+    tokenizer = MyanmarTokenizer()
+    for case in cases:
+        result = tokenizer.cutCategory(case[0])
+        # if '|'+result+'|' != case[1]:
+        #     print case, result
+        print case, result, '|' + result + '|' == case[1]
+
+    # regex engine直接扫描字符，每个category取一个代表字符来验证cases
+    categoryCode = dict((_name, unichr(_range[0])) for _name, _range in MyanmarTokenizer._CATEGORY_RANGE)
+    for case in cases:
+        sentence = u''.join(categoryCode[c] for c in case[0])
+        result = tokenizer._syllableSegmentationRegex(sentence)
+        print case[0], 'regex', result == tokenizer._syllableSegmentation(case[0], sentence)[1]
+
+    lines = codecs.open('samples.txt', 'r', 'utf16').readlines()
+    tokenizer.separator = '@@'
+    for lineno, line in enumerate(lines):
+        case = line.strip().split('!!!')
+        if len(case) == 1:
+            case = [case[0], case[0]]
+        result = tokenizer.cut(case[0])
+        print u'%3d\t%s\t%s\t=>\t%s\t==\t%s' % (lineno+1, result == case[1], case[0], case[1], result)
+
+    # 各engine的结果应与rule engine完全一致
+    reference = MyanmarTokenizer('@@', 'rule')
+    for engine in sorted(MyanmarTokenizer._ENGINES):
+        engineTokenizer = MyanmarTokenizer('@@', engine)
+        same = sum(1 for line in lines if engineTokenizer.cut(line.strip()) == reference.cut(line.strip()))
+        print 'engine %s: %d/%d' % (engine, same, len(lines))
+
+    # tokenizer = MyanmarTokenizer()
+    # seg = "ကမ္ဘာ့ဘဏ်အုပ်စု၏အဖွဲ့ဝင်"
+    # seg = "ဆင်"
+    # seg = "ကမ္ဘာ့ဘဏ်အုပ်abcdefgစု၏အဖွဲ့ဝင်"
+    # seg = "ဆabcင်"
+    # seg = 'ကော်'
+    seg = 'စာကြည့်တိုက်'
+    print tokenizer.code2Category(seg)
+    # result = tokenizer.cutRecursively(seg)
+    # print result
+    result = tokenizer.cut(seg)
+    print result
+    # tokenizer.cutCategory('ECSCVCC')
+    # test();
+
+
+def _compareSentences(count, seed=0):
+    ''' compareEngines使用的输入：samples.txt、_TEST_CASES（每个category随机取一个字符）和随机生成的句子，
+    随机句子包含各category的字符、未分配的Myanmar字符、空格和拉丁字母
+    :return: [(来源, sentence), ...]
+    '''
+    import random
+    rand = random.Random(seed)
+    sentences = []
+    for lineno, line in enumerate(codecs.open('samples.txt', 'r', 'utf16')):
+        sentences.append(('samples.txt:%d' % (lineno + 1), line.strip().split('!!!')[0]))
+    categoryCodes = dict((_name, [unichr(_code) for _code in _range])
+                         for _name, _range in MyanmarTokenizer._CATEGORY_RANGE)
+    for case in _TEST_CASES:
+        sentences.append(('case %s' % case[0], u''.join(rand.choice(categoryCodes[c]) for c in case[0])))
+    codes = [code for codes in categoryCodes.values() for code in codes]
+    unknowns = [unichr(_code) for _code in range(MyanmarTokenizer._MYANMAR_CODES_START,
+                                                 MyanmarTokenizer._MYANMAR_CODES_END + 1)
+                if unichr(_code) not in MyanmarTokenizer.codeCategory]
+    others = [u' ', u'a', u'Z', u'1', u'.']
+    for i in range(count):
+        if i % 2:
+            # 只有category合法组合的字符
+            characters = [rand.choice(codes) for _ in range(rand.randint(1, 40))]
+        else:
+            characters = [rand.choice(unknowns) if rand.random() < 0.05 else
+                          rand.choice(others) if rand.random() < 0.1 else rand.choice(codes)
+                          for _ in range(rand.randint(1, 40))]
+        sentences.append(('random %d' % i, u''.join(characters)))
+    return sentences
+
+
+def _firstDivergence(reference, candidate, context=20):
+    ''' 第一个不同的字符位置，以及两边前后context个字符
+    '''
+    index = 0
+    while index < min(len(reference), len(candidate)) and reference[index] == candidate[index]:
+        index += 1
+    start = max(0, index - context)
+    return index, reference[start:index + context], candidate[start:index + context]
+
+
+def compareEngines(engine, reference='rule', count=10000, seed=0, separator='@@'):
+    ''' 差分测试：用reference engine（默认rule，即_syllableSegmentation）和engine切分同样的输入，
+    包括samples.txt、_TEST_CASES和随机句子，比较cut的结果（'?'标记和非Myanmar部分的处理也要一致）
+    :param engine: 被测试的engine
+    :param reference: 作为标准的engine
+    :param count: 随机句子数
+    :param seed: 随机数种子
+    :param separator:
+    :return: 不一致的句子数
+    '''
+    sentences = _compareSentences(count, seed)
+    referenceTokenizer = MyanmarTokenizer(separator, reference)
+    candidateTokenizer = MyanmarTokenizer(separator, engine)
+    ts = time.time()
+    expected = [referenceTokenizer.cut(sentence) for _, sentence in sentences]
+    referenceTime = time.time() - ts
+    ts = time.time()
+    results = [candidateTokenizer.cut(sentence) for _, sentence in sentences]
+    candidateTime = time.time() - ts
+
+    divergences = 0
+    for (source, sentence), result, expect in zip(sentences, results, expected):
+        if result == expect:
+            continue
+        divergences += 1
+        if divergences == 1:
+            index, expectContext, resultContext = _firstDivergence(expect, result)
+            print u'first divergence: %s, at %d' % (source, index)
+            print u'  sentence:  %s' % sentence
+            print u'  categorys: %s' % referenceTokenizer.code2Category(sentence)
+            print u'  %-9s  ...%s...' % (reference + ':', expectContext)
+            print u'  %-9s  ...%s...' % (engine + ':', resultContext)
+    if engine == 'numpy':
+        # numpy engine的cutText一次处理整个文本
+        text = u'\n'.join(sentence for _, sentence in sentences)
+        if candidateTokenizer.cutText(text) != u'\n'.join(expected):
+            print 'cutText differs from cut'
+            divergences += 1
+    print '%s vs %s: %d sentences, %d divergences, %.3fs vs %.3fs' % (
+        engine, reference, len(sentences), divergences, candidateTime, referenceTime)
+    return divergences
+
+
+def _benchmarkCorpora(size, seed=0):
+    ''' 用samples.txt里的音节随机生成三种语料，每种约size个字符
+    short: 1~6个音节的短行，音节之间偶尔有空格
+    long: 很长的不含空格的Myanmar行
+    mixed: Myanmar音节、拉丁字母单词和数字混合，以空格分隔
+    :return: [(name, [line, ...]), ...]
+    '''
+    import random
+    rand = random.Random(seed)
+    tokenizer = MyanmarTokenizer()
+    syllables = set()
+    for line in codecs.open('samples.txt', 'r', 'utf16'):
+        for syllable in tokenizer.syllables(line.strip().split('!!!')[0]):
+            if MyanmarTokenizer._MYANMAR_CODES_START <= ord(syllable[0]) <= MyanmarTokenizer._MYANMAR_CODES_END:
+                syllables.add(syllable)
+    syllables = sorted(syllables)
+    words = ['the', 'Myanmar', 'http://example.com', 'ID', 'x86_64', '2016', 'OK', 'tokenizer']
+
+    def generate(makeLine):
+        lines = []
+        count = 0
+        while count < size:
+            line = makeLine()
+            lines.append(line)
+            count += len(line)
+        return lines
+
+    def shortLine():
+        return u''.join(rand.choice(syllables) + (u' ' if rand.random() < 0.2 else u'')
+                        for _ in range(rand.randint(1, 6))).strip()
+
+    def longLine():
+        return u''.join(rand.choice(syllables) for _ in range(2000))
+
+    def mixedLine():
+        return u' '.join(rand.choice(words) if rand.random() < 0.3 else u''.join(rand.choice(syllables)
+                         for _ in range(rand.randint(1, 4))) for _ in range(rand.randint(5, 30)))
+
+    return [('short', generate(shortLine)), ('long', generate(longLine)), ('mixed', generate(mixedLine))]
+
+
+def _benchmarkRun(name, lines, run):
+    ''' 在fork的子进程里执行run()，输出耗时、chars/s、lines/s和峰值内存的增加量。
+    子进程的ru_maxrss从fork时的RSS开始，减去开始时的值就是run本身（包括它创建的worker进程）增加的峰值内存，
+    不受之前测过的其他方法影响
+    '''
+    import resource
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid != 0:
+        os.waitpid(pid, 0)
+        return
+    try:
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        ts = time.time()
+        try:
+            run()
+        except RuntimeError as e:
+            print '%-28s %s' % (name, e)
+            return
+        seconds = time.time() - ts
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        chars = sum(len(line) for line in lines)
+        print '%-28s %8.3fs %12.0f chars/s %10.0f lines/s %8d KB' % (
+            name, seconds, chars / seconds if seconds else 0, len(lines) / seconds if seconds else 0,
+            max(peak - base, 0))
+    finally:
+        sys.stdout.flush()
+        os._exit(0)
+
+
+def benchmark(size=200000, jobs=4, seed=0):
+    ''' 在生成的语料上对各切分方法计时，输出耗时、chars/s、lines/s和峰值内存的增加量（见_benchmarkRun）
+    :param size: 每种语料的大约字符数
+    :param jobs: 目录模式最多使用的worker进程数，按1, 2, 4...递增测试
+    :param seed: 随机数种子，相同的seed生成相同的语料
+    '''
+    import tempfile
+    import shutil
+    corpora = _benchmarkCorpora(size, seed)
+    tokenizer = MyanmarTokenizer()
+    for corpus, lines in corpora:
+        print '%s: %d lines, %d chars' % (corpus, len(lines), sum(len(line) for line in lines))
+        for engine in sorted(MyanmarTokenizer._ENGINES):
+            try:
+                engineTokenizer = MyanmarTokenizer(engine=engine)
+            except ImportError:
+                print '%-28s not available' % ('cut(%s)' % engine)
+                continue
+            if engine == 'numpy':
+                run = lambda: engineTokenizer.cutText(u'\n'.join(lines))
+            else:
+                run = lambda: [engineTokenizer.cut(line) for line in lines]
+            _benchmarkRun('cut(%s)' % engine, lines, run)
+
+        _benchmarkRun('cutRecursively', lines, lambda: [tokenizer.cutRecursively(line) for line in lines])
+        _benchmarkRun('code2Category', lines, lambda: [tokenizer.code2Category(line) for line in lines])
+        categorys = [tokenizer.code2Category(line) for line in lines]
+        _benchmarkRun('cutCategory', lines, lambda: [tokenizer.cutCategory(line) for line in categorys])
+
+    # 目录模式：所有语料分成多个文件，比较线程和不同worker进程数
+    inputDir = tempfile.mkdtemp()
+    outputDir = tempfile.mkdtemp()
+    try:
+        allLines = []
+        for corpus, lines in corpora:
+            for i in range(0, len(lines), 200):
+                with codecs.open(os.path.join(inputDir, '%s-%05d.txt' % (corpus, i)), 'w', 'utf8') as fp:
+                    fp.write(u''.join(line + u'\n' for line in lines[i:i + 200]))
+            allLines.extend(lines)
+        print 'directory: %d files' % len(os.listdir(inputDir))
+
+        def directory(n):
+            stdout, stderr = sys.stdout, sys.stderr
+            sys.stdout = sys.stderr = open(os.devnull, 'w')  # 目录模式会输出进度
+            try:
+                analyzeParams(['-i', inputDir, '-o', outputDir, '-j', str(n)])
+            finally:
+                sys.stdout.close()
+                sys.stdout, sys.stderr = stdout, stderr
+
+        workers = [0]
+        while workers[-1] < jobs:
+            workers.append(max(1, workers[-1] * 2))
+        for n in workers:
+            _benchmarkRun('directory -j %d' % n if n else 'directory (threads)', allLines, lambda: directory(n))
+    finally:
+        shutil.rmtree(inputDir)
+        shutil.rmtree(outputDir)
+
+
+# 进程池中每个worker进程自己的MyanmarTokenizer，由_initWorker创建；单进程时为_useWorkerTokenizer传入的tokenizer
+_workerTokenizer = None
+
+
+def _initWorker(separator, engine, cacheSize=0, dictionaryPath=None):
+    global _workerTokenizer
+    _workerTokenizer = MyanmarTokenizer(separator, engine, cacheSize, dictionaryPath)
+
+
+def _useWorkerTokenizer(tokenizer):
+    ''' 不开进程池时，worker函数直接在当前进程里用tokenizer切分，stats、缓存和新的Myanmar部分都记在它上面
+    :param tokenizer: MyanmarTokenizer
+    '''
+    global _workerTokenizer
+    _workerTokenizer = tokenizer
+
+
+def _cutFile(inputPath, outputPath, coding):
+    ''' 在worker进程里打开文件并切分
+    :param inputPath: 输入文件，或utils.getSources返回的zip成员，压缩文件边读边解压
+    :param outputPath: 输出文件，为None时返回切分结果，扩展名为.gz/.bz2/.xz时压缩输出
+    :param coding: 输入文件编码
+    :return: (outputPath为None时为切分结果，否则为None, 磁盘字典里没有的Myanmar部分)
+    '''
+    from StringIO import StringIO
+    if outputPath is not None:
+        try:
+            os.makedirs(os.path.split(outputPath)[0])
+        except:
+            pass
+    if isinstance(inputPath, tuple) or utils.isCompressed(inputPath):
+        stdin = codecs.getreader(coding)(utils.openSource(inputPath))
+    else:
+        stdin = codecs.open(inputPath, 'r', coding)
+    if outputPath is None:
+        stdout = StringIO()
+    elif utils.isCompressed(outputPath):
+        stdout = codecs.getwriter('utf8')(utils.openOutput(outputPath))
+    else:
+        stdout = codecs.open(outputPath, 'w', 'utf8')
+    _workerTokenizer.cutStd(stdin, stdout)
+    stdin.close()
+    if outputPath is None:
+        return stdout.getvalue(), _workerTokenizer.takeNewRuns()
+    stdout.close()
+    return None, _workerTokenizer.takeNewRuns()
+
+
+# 进程里已映射的输入文件，{path: mmap}，同一进程的各范围共用一个映射
+_mappedFiles = {}
+
+
+def _cutRange(inputPath, start, end, coding, mapped=False):
+    ''' 在worker进程里切分文件的一段（按行对齐的字节范围），每行与cutStd的结果一致
+    :param inputPath: 输入文件
+    :param start: 起始字节
+    :param end: 结束字节
+    :param coding: 该范围的编码，见utils.getLineRanges
+    :param mapped: 是否从mmap映射的文件直接解码，不经过文件对象的缓冲
+    :return: (utf8编码的切分结果, 磁盘字典里没有的Myanmar部分)
+    '''
+    if mapped:
+        if inputPath not in _mappedFiles:
+            _mappedFiles[inputPath] = utils.mapFile(inputPath)
+        text = _mappedFiles[inputPath][start:end].decode(coding)
+    else:
+        with open(inputPath, 'rb') as fp:
+            fp.seek(start)
+            text = fp.read(end - start).decode(coding)
+    return _workerTokenizer.cutLines(text.splitlines()).encode('utf8'), _workerTokenizer.takeNewRuns()
+
+
+def _offsetsRange(inputPath, start, end, coding):
+    ''' 在worker进程里切分文件的一段（按行对齐的字节范围），结果为各行音节长度的record，见python_utils.offsets
+    行按'\n'分开（不是splitlines），这样才能算出每行在文件里的起始字节
+    :return: (records, [(record在records里的位置, 行在文件里的起始字节), ...])
+    '''
+    import offsets
+    with open(inputPath, 'rb') as fp:
+        fp.seek(start)
+        text = fp.read(end - start).decode(coding)
+    lines = text.split(u'\n')
+    if not lines[-1]:
+        lines.pop()
+    records = []
+    entries = []
+    pos = 0
+    for line in lines:
+        entries.append((pos, start))
+        start += len(line.encode(coding)) + len(u'\n'.encode(coding))
+        if line.endswith(u'\r'):
+            line = line[:-1]
+        boundaries = _workerTokenizer.boundaries(line)
+        lengths = [boundaries[i + 1] - boundaries[i] for i in xrange(len(boundaries) - 1)]
+        if boundaries:
+            lengths.append(len(line) - boundaries[-1])
+        record = offsets.encodeRecord(lengths)
+        records.append(record)
+        pos += len(record)
+    return ''.join(records), entries
+
+
+def _cutLines(lines):
+    ''' 在worker进程里切分一批utf8编码的行，--serve使用
+    :param lines: [utf8 str, ...]
+    :return: ([utf8 str, ...], 磁盘字典里没有的Myanmar部分)
+    '''
+    results = [_workerTokenizer.cut(line.decode('utf8', 'replace').strip()).encode('utf8') for line in lines]
+    return results, _workerTokenizer.takeNewRuns()
+
+
+def _countLines(counter, lines):
+    ''' 切分若干行并统计音节unigram/bigram，非Myanmar部分按空白分成token
+    '''
+    for syllables in _workerTokenizer.cutMany([line.strip() for line in lines]):
+        counter.add([token for syllable in syllables for token in syllable.split()])
+
+
+def _countRange(inputPath, start, end, coding, spillDir, maxEntries):
+    ''' 在worker进程里统计文件一段（按行对齐的字节范围）的音节unigram/bigram，见_cutRange
+    :return: run文件，见ngram.NgramCounter
+    '''
+    import ngram
+    with open(inputPath, 'rb') as fp:
+        fp.seek(start)
+        text = fp.read(end - start).decode(coding)
+    counter = ngram.NgramCounter(spillDir, maxEntries)
+    _countLines(counter, text.splitlines())
+    return counter.finish()
+
+
+def _countSource(source, coding, spillDir, maxEntries):
+    ''' 在worker进程里边解压边统计压缩文件（或zip成员）的音节unigram/bigram，见utils.getSources
+    :return: run文件，见ngram.NgramCounter
+    '''
+    import ngram
+    counter = ngram.NgramCounter(spillDir, maxEntries)
+    stdin = codecs.getreader(coding)(utils.openSource(source))
+    lines = []
+    for line in stdin:
+        lines.append(line)
+        if len(lines) >= 10000:
+            _countLines(counter, lines)
+            lines = []
+    _countLines(counter, lines)
+    stdin.close()
+    return counter.finish()
+
+
+def _cutAppended(tokenizer, inputPath, stdout, coding, offset, blockSize=16 * 1024 * 1024):
+    ''' 从offset开始切分文件中新增的完整行（以换行结束），末尾还没写完的行留到下次
+    :param tokenizer:
+    :param inputPath: 输入文件
+    :param stdout: 以二进制方式打开，写入utf8编码的结果
+    :param coding: 输入文件编码
+    :param offset: 上次处理到的字节位置
+    :param blockSize: 每次读取的字节数
+    :return: (处理到的字节位置, 处理的行数)
+    '''
+    lineCount = 0
+    with open(inputPath, 'rb') as fp:
+        rangeCoding, start, unit = utils.getRangeCoding(fp, coding)
+        newline = u'\n'.encode(rangeCoding)
+        offset = max(offset, start)
+        fp.seek(offset)
+        buf = ''
+        while True:
+            block = fp.read(blockSize)
+            if not block:
+                break
+            buf += block
+            # 最后一个与字符对齐的换行
+            end = buf.rfind(newline)
+            while end >= 0 and end % unit != 0:
+                end = buf.rfind(newline, 0, end + len(newline) - 1)
+            if end < 0:
+                continue
+            end += len(newline)
+            lines = buf[:end].decode(rangeCoding).splitlines()
+            buf = buf[end:]
+            stdout.write(tokenizer.cutLines(lines).encode('utf8'))
+            lineCount += len(lines)
+            offset += end
+    return offset, lineCount
+
+
+def _loadCheckpoint(path):
+    ''' checkpoint文件：{输入文件: {'offset': 处理到的字节位置, 'lines': 行数, 'size': 大小, 'mtime': 修改时间}}
+    '''
+    import json
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as fp:
+        return json.load(fp)
+
+
+def _saveCheckpoint(path, checkpoint):
+    ''' 先写临时文件再rename，中断时checkpoint仍是完整的
+    '''
+    import json
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'w') as fp:
+        json.dump(checkpoint, fp, indent=1, sort_keys=True)
+    os.rename(tmpPath, path)
+
+
+def _writeResults(pending, stdout, limit, tokenizer):
+    ''' 按提交顺序取回进程池的结果并写入stdout，直到未完成的任务不超过limit个
+    :param tokenizer: 收集各worker返回的磁盘字典里没有的Myanmar部分，见addNewRuns
+    '''
+    while len(pending) > limit or (pending and pending[0].ready()):
+        result, runs = pending.popleft().get()
+        tokenizer.addNewRuns(*runs)
+        if result is not None:
+            stdout.write(result)
+
+
+def analyzeParams(args):
+    from optparse import OptionParser
+    parser = OptionParser(usage="%prog -s -i FILE or [< FILE] -o FILE or [> FILE]", version="%prog 1.0")
+
+    # add_option用来加入选项，action是有store，store_true，store_false等，dest是存储的变量，default是缺省值，help是帮助提示
+    parser.set_description(u'Syllable Segmentation Program of Myanmar\n');
+
+    parser.add_option("-s", "--separator", dest="separator", metavar="string"
+                      , help=u'Syllable breaking symbol, default use |', default='|')
+    parser.add_option("-e", "--engine", dest="engine", metavar="string", type="choice"
+                      , choices=sorted(MyanmarTokenizer._ENGINES.keys())
+                      , help=u'Syllable segmentation engine: %s, default use %s'
+                             % (', '.join(sorted(MyanmarTokenizer._ENGINES.keys())), MyanmarTokenizer._DEFAULT_ENGINE)
+                      , default=MyanmarTokenizer._DEFAULT_ENGINE)
+    parser.add_option("-c", "--coding", dest="coding", metavar="string"
+                      , help=u'Input file coding, default use utf8', default='utf8')
+
+    parser.add_option("-i", "--input", dest="input", metavar="FILE", action="store"
+                      , help=u'Input file(dir) path， or < FILE')
+    parser.add_option("-o", "--output", dest="output", metavar="FILE", action="store"
+                      , help=u'Output file(dir) path, or > FILE')
+    parser.add_option("-j", "--jobs", dest="jobs", metavar="N", type="int"
+                      , help=u'Worker processes, an input file is split into line-aligned chunks'
+                             u', default use threads for an input dir', default=0)
+    parser.add_option("-m", "--mmap", dest="mmap", action="store_true"
+                      , help=u'Map an input file into memory and decode line-aligned chunks from it'
+                             u', workers share the mapping with --jobs', default=False)
+    parser.add_option("-b", "--buffer-size", dest="bufferSize", metavar="BYTES", type="int"
+                      , help=u'Stream an input file (or stdin) in binary blocks of BYTES, default read line by line'
+                      , default=0)
+    parser.add_option("--cache-size", dest="cacheSize", metavar="N", type="int"
+                      , help=u'LRU cache N segmented Myanmar runs in each tokenizer, default use 0 (no cache)'
+                      , default=0)
+    parser.add_option("-d", "--dictionary", dest="dictionary", metavar="FILE"
+                      , help=u'On-disk dictionary of segmented Myanmar runs, shared read-only by the workers'
+                             u' and merged with the newly seen runs at the end of the job')
+    parser.add_option("--ngrams", dest="ngrams", action="store_true"
+                      , help=u'Count syllable unigrams and bigrams instead of writing segmented text'
+                             u', output lines are "syllable[ syllable]<TAB>count" sorted by syllables', default=False)
+    parser.add_option("--memory-limit", dest="memoryLimit", metavar="MB", type="int"
+                      , help=u'With --ngrams, spill sorted partial counts to disk above about MB per process'
+                             u', default use 512', default=512)
+    parser.add_option("--lexicon", dest="lexicon", metavar="FILE"
+                      , help=u'Compiled lexicon (double-array trie of syllables) used by --words')
+    parser.add_option("--build-lexicon", dest="buildLexicon", metavar="FILE"
+                      , help=u'Compile the word list FILE ("word [freq]" per line, coding -c) into --lexicon FILE')
+    parser.add_option("--words", dest="words", metavar="METHOD", type="choice", choices=['mm', 'dag']
+                      , help=u'Segment words on top of syllables with --lexicon: mm (forward maximum matching)'
+                             u' or dag (max probability by word freq)')
+    parser.add_option("--ids", dest="ids", metavar="FILE"
+                      , help=u'Write syllable ids as packed uint32 arrays instead of text, with FILE as the vocabulary'
+                             u' (loaded if it exists, saved after cutting)')
+    parser.add_option("--frozen-vocab", dest="frozenVocab", action="store_true", default=False
+                      , help=u'With --ids: do not add new syllables to the vocabulary, unknown ones get id 0')
+    parser.add_option("--offsets", dest="offsets", action="store_true", default=False
+                      , help=u'Write binary syllable lengths per line with a line index instead of text'
+                             u' (needs -i FILE and -o FILE; read back with python_utils.offsets.OffsetsReader)')
+    parser.add_option("--compress", dest="compress", metavar="FORMAT", type="choice", choices=['gz', 'bz2', 'xz']
+                      , help=u'Compress each output file in directory mode (-o DIR); a single -o FILE'
+                             u' is compressed by its .gz/.bz2/.xz extension')
+    parser.add_option("--checkpoint", dest="checkpoint", metavar="FILE"
+                      , help=u'Record the offset of each input file in FILE, next run only cuts the appended lines'
+                             u' and appends to the output; unchanged files in an input dir are skipped')
+    parser.add_option("--serve", dest="serve", metavar="ADDRESS"
+                      , help=u'Serve requests on HOST:PORT or a Unix socket path: each line sent is answered'
+                             u' with its segmented line, concurrent requests are batched (workers with --jobs)')
+    parser.add_option("--http", dest="http", action="store_true"
+                      , help=u'With --serve, answer HTTP POST requests (body lines => segmented lines)', default=False)
+    parser.add_option("--batch-size", dest="batchSize", metavar="N", type="int"
+                      , help=u'With --serve, max lines batched into one segmentation call, default use 256'
+                      , default=256)
+    parser.add_option("--batch-delay", dest="batchDelay", metavar="MS", type="float"
+                      , help=u'With --serve, max milliseconds to wait for more requests to batch, default use 2'
+                      , default=2.0)
+    parser.add_option("--stats", dest="stats", action="store_true"
+                      , help=u'Record time per phase, break status per table level and cache behavior of cut'
+                             u' in this process, print them as json at exit', default=False)
+    parser.add_option("--compare", dest="compare", metavar="ENGINE", type="choice"
+                      , choices=sorted(MyanmarTokenizer._ENGINES.keys())
+                      , help=u'Differential test ENGINE against the rule engine on samples.txt, the test cases'
+                             u' and random sentences, report the first divergence')
+    parser.add_option("--benchmark", dest="benchmark", metavar="CHARS", type="int"
+                      , help=u'Benchmark every segmentation path on generated corpora of about CHARS characters each'
+                             u', the directory mode with up to --jobs workers (default 4)')
+    parser.add_option("--chunk-size", dest="chunkSize", metavar="BYTES", type="int"
+                      , help=u'Chunk size of an input file with --jobs, default use 16M', default=16 * 1024 * 1024)
+
+#     if len(args) <= 1:
+#         parser.print_help(sys.stderr)
+#         eg = '''eg:
+# python myanmar-tokenizer.py
+# python myanmar-tokenizer.py -s "@" -i file -o file
+# python myanmar-tokenizer.py -s "@" < inputfile > outputfile
+#
+#         \n'''
+#         sys.stderr.write(eg)
+#         return
+
+    (opt, args) = parser.parse_args(args)
+
+    if opt.compare != None:
+        if compareEngines(opt.compare):
+            sys.exit(1)
+        return
+    if opt.benchmark != None:
+        benchmark(opt.benchmark, opt.jobs or 4)
+        return
+
+    if opt.buildLexicon != None:
+        if opt.lexicon == None:
+            parser.error('--build-lexicon needs --lexicon FILE')
+        count = MyanmarTokenizer(engine=opt.engine).buildLexicon(opt.buildLexicon, opt.lexicon, opt.coding)
+        sys.stderr.write('lexicon: %d words\n' % count)
+        return
+    if opt.words != None and opt.lexicon == None:
+        parser.error('--words needs --lexicon FILE')
+    if opt.offsets and (opt.input == None or not os.path.isfile(opt.input) or utils.isCompressed(opt.input)
+                        or opt.output == None):
+        parser.error('--offsets needs -i FILE and -o FILE')
+    if opt.checkpoint != None and opt.input != None:
+        # 压缩文件不能从上次的位置继续读
+        paths = utils.getFiles(opt.input, recursive=True) if os.path.isdir(opt.input) else [opt.input]
+        if any(utils.isCompressed(path) for path in paths):
+            parser.error('--checkpoint does not support compressed input')
+
+    tokenizer = MyanmarTokenizer(opt.separator, opt.engine, opt.cacheSize, opt.dictionary, opt.stats, opt.lexicon)
+
+    if opt.serve != None:
+        # 常驻服务：合并并发的请求，每批在worker进程（或当前进程）里切分
+        import batchserver
+        address = opt.serve
+        if ':' in address and os.path.sep not in address:
+            host, port = address.rsplit(':', 1)
+            address = (host, int(port))
+        import signal
+        import threading
+        if opt.jobs > 0:
+            import task
+            tokenizerTask = task.Task(opt.jobs, True, _initWorker,
+                                      (opt.separator, opt.engine, opt.cacheSize, opt.dictionary))
+            cutLines = lambda lines: tokenizerTask.add_async(_cutLines, (lines,)).get()
+        else:
+            _useWorkerTokenizer(tokenizer)
+            cutLines = _cutLines
+        # 各批的新Myanmar部分收集到tokenizer上，退出时写入磁盘字典；多批可能同时处理
+        runsLock = threading.Lock()
+
+        def process(lines):
+            results, newRuns = cutLines(lines)
+            with runsLock:
+                tokenizer.addNewRuns(*newRuns)
+            return results
+
+        # SIGTERM与Ctrl-C一样正常退出，保存磁盘字典
+        def terminate(signum, frame):
+            raise KeyboardInterrupt()
+        signal.signal(signal.SIGTERM, terminate)
+        try:
+            server = batchserver.createServer(address, process, opt.http, opt.batchSize, opt.batchDelay / 1000.0,
+                                              max(opt.jobs, 1))
+        except ValueError as e:
+            parser.error(str(e))
+        sys.stderr.write('serving on %s\n' % (server.server_address,))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        if opt.jobs > 0:
+            tokenizerTask.join()
+    elif opt.words != None:
+        # 词切分：每行先切音节再按lexicon匹配
+        stdin = codecs.getreader(opt.coding)(sys.stdin)
+        stdout = codecs.getwriter('utf8')(sys.stdout)
+        if opt.input != None:
+            stdin = utils.readLines(opt.input, opt.coding)
+        if opt.output != None:
+            stdout = codecs.open(opt.output, 'w', 'utf8')
+        for line in stdin:
+            stdout.write(tokenizer.cutWords(line.strip(), opt.words) + os.linesep)
+        stdin.close()
+        stdout.close()
+    elif opt.ids != None:
+        import vocab
+        vocabulary = vocab.Vocabulary(opt.ids, opt.frozenVocab)
+        stdin = codecs.getreader(opt.coding)(sys.stdin)
+        stdout = sys.stdout
+        if opt.input != None:
+            stdin = utils.readLines(opt.input, opt.coding)
+        if opt.output != None:
+            stdout = open(opt.output, 'wb')
+        tokenizer.cutIds(stdin, stdout, vocabulary)
+        stdin.close()
+        stdout.close()
+        if not opt.frozenVocab:
+            vocabulary.save(opt.ids)
+    elif opt.offsets:
+        # 各段的record按顺序写出，index记录每行record的位置和原文的起始字节
+        import offsets
+        writer = offsets.OffsetsWriter(open(opt.output, 'wb'))
+        rangeCoding, ranges = utils.getLineRanges(opt.input, opt.coding, opt.chunkSize)
+        if opt.jobs > 0:
+            import task
+            tokenizerTask = task.Task(opt.jobs, True, _initWorker, (opt.separator, opt.engine))
+            results = [tokenizerTask.add_async(_offsetsRange, (opt.input, start, end, rangeCoding))
+                       for start, end in ranges]
+            for result in results:
+                writer.write(*result.get())
+            tokenizerTask.join()
+        else:
+            _useWorkerTokenizer(tokenizer)
+            for start, end in ranges:
+                writer.write(*_offsetsRange(opt.input, start, end, rangeCoding))
+        writer.close()
+    elif opt.ngrams:
+        # 各进程分别计数并把部分结果排序写到临时目录，最后归并
+        import tempfile
+        import shutil
+        import ngram
+        stdout = sys.stdout
+        if opt.output != None:
+            stdout = open(opt.output, 'wb')
+        spillDir = tempfile.mkdtemp(prefix='ngram')
+        maxEntries = opt.memoryLimit * 1024 * 1024 // ngram.ENTRY_BYTES
+        try:
+            runs = []
+            if opt.input == None:
+                _useWorkerTokenizer(tokenizer)
+                counter = ngram.NgramCounter(spillDir, maxEntries)
+                lines = []
+                for line in codecs.getreader(opt.coding)(sys.stdin):
+                    lines.append(line)
+                    if len(lines) >= 10000:
+                        _countLines(counter, lines)
+                        lines = []
+                _countLines(counter, lines)
+                runs = counter.finish()
+            else:
+                paths = utils.getFiles(opt.input, recursive=True) if os.path.isdir(opt.input) else [opt.input]
+                # 普通文件按行对齐的范围统计，压缩文件（zip的每个成员）边解压边统计
+                works = []
+                for path in paths:
+                    if utils.isCompressed(path):
+                        works.extend((_countSource, (source, opt.coding, spillDir, maxEntries))
+                                     for source in utils.getSources(path))
+                        continue
+                    rangeCoding, pathRanges = utils.getLineRanges(path, opt.coding, opt.chunkSize)
+                    works.extend((_countRange, (path, start, end, rangeCoding, spillDir, maxEntries))
+                                 for start, end in pathRanges)
+                if opt.jobs > 0:
+                    import task
+                    tokenizerTask = task.Task(opt.jobs, True, _initWorker, (opt.separator, opt.engine))
+                    results = [tokenizerTask.add_async(work, args) for work, args in works]
+                    for result in results:
+                        runs.extend(result.get())
+                    tokenizerTask.join()
+                else:
+                    _useWorkerTokenizer(tokenizer)
+                    for work, args in works:
+                        runs.extend(work(*args))
+            count = ngram.mergeRuns(runs, stdout)
+            sys.stderr.write('ngrams: %d\n' % count)
+        finally:
+            shutil.rmtree(spillDir)
+        stdout.close()
+    elif opt.checkpoint != None:
+        # 每个输入文件只切分上次checkpoint之后新增的行，结果追加到输出后面
+        if opt.input == None:
+            parser.error('--checkpoint needs an input file(dir)')
+        checkpoint = _loadCheckpoint(opt.checkpoint)
+        isdir = opt.output != None and os.path.isdir(opt.input) and os.path.isdir(opt.output)
+        # 目录下的所有文件写到一个输出文件时只能追加；单个输入文件的输出在确定offset后再打开
+        concatenated = opt.output != None and not isdir and os.path.isdir(opt.input)
+        stdout = sys.stdout
+        if concatenated:
+            stdout = open(opt.output, 'ab' if checkpoint else 'wb')
+        if os.path.isdir(opt.input):
+            inputpathLen = len(opt.input.rstrip(os.path.sep))
+            unchanged = dict((path, (value['size'], value['mtime'])) for path, value in checkpoint.iteritems())
+            paths = utils.getFiles(opt.input, recursive=True, unchanged=unchanged)
+        else:
+            paths = [opt.input]
+        for path in paths:
+            stat = os.stat(path)
+            value = checkpoint.get(path, {'offset': 0, 'lines': 0})
+            if stat.st_size < value['offset']:
+                value = {'offset': 0, 'lines': 0}  # 文件被截断或替换，重新切分
+            if isdir:
+                op = os.path.join(opt.output, path[inputpathLen + 1:])
+                try:
+                    os.makedirs(os.path.split(op)[0])
+                except:
+                    pass
+                stdout = open(op, 'ab' if value['offset'] > 0 else 'wb')
+            elif opt.output != None and not concatenated:
+                stdout = open(opt.output, 'ab' if value['offset'] > 0 else 'wb')
+            offset, lineCount = _cutAppended(tokenizer, path, stdout, opt.coding, value['offset'])
+            if isdir or (opt.output != None and not concatenated):
+                stdout.close()
+            else:
+                stdout.flush()
+            checkpoint[path] = {'offset': offset, 'lines': value['lines'] + lineCount,
+                                'size': stat.st_size, 'mtime': stat.st_mtime}
+            _saveCheckpoint(opt.checkpoint, checkpoint)
+            sys.stderr.write('%s: %d lines\n' % (path, lineCount))
+        if concatenated:
+            stdout.close()
+    elif opt.input != None and os.path.isfile(opt.input) and utils.isCompressed(opt.input):
+        # 边解压边切分，不解压到磁盘；zip的各成员可以在多个进程里并行切分，结果按成员顺序写出
+        stdout = sys.stdout
+        if opt.output != None:
+            stdout = utils.openOutput(opt.output)
+        sources = list(utils.getSources(opt.input))
+        if opt.jobs > 0:
+            import collections
+            import task
+            writer = codecs.getwriter('utf8')(stdout)
+            tokenizerTask = task.Task(opt.jobs, True, _initWorker,
+                                      (opt.separator, opt.engine, opt.cacheSize, opt.dictionary))
+            pending = collections.deque()
+            for source in sources:
+                pending.append(tokenizerTask.add_async(_cutFile, (source, None, opt.coding)))
+                _writeResults(pending, writer, 2 * opt.jobs - 1, tokenizer)
+            _writeResults(pending, writer, 0, tokenizer)
+            tokenizerTask.join()
+        else:
+            for source in sources:
+                stdin = utils.openSource(source)
+                tokenizer.cutStream(stdin, stdout, opt.coding, opt.bufferSize or 1024 * 1024)
+                stdin.close()
+        stdout.close()
+    elif opt.input != None and os.path.isfile(opt.input) and opt.jobs > 0:
+        # 按行对齐切成若干字节范围并行切分，按原顺序写出；最多2*jobs个范围同时在处理
+        import collections
+        import task
+        stdout = sys.stdout
+        if opt.output != None:
+            stdout = open(opt.output, 'wb')
+        rangeCoding, ranges = utils.getLineRanges(opt.input, opt.coding, opt.chunkSize)
+        tokenizerTask = task.Task(opt.jobs, True, _initWorker,
+                                  (opt.separator, opt.engine, opt.cacheSize, opt.dictionary))
+        pending = collections.deque()
+        for start, end in ranges:
+            pending.append(tokenizerTask.add_async(_cutRange, (opt.input, start, end, rangeCoding, opt.mmap)))
+            _writeResults(pending, stdout, 2 * opt.jobs - 1, tokenizer)
+        _writeResults(pending, stdout, 0, tokenizer)
+        tokenizerTask.join()
+        stdout.close()
+    elif opt.input != None and os.path.isfile(opt.input) and opt.mmap:
+        # 单进程映射整个文件，按行对齐的范围依次解码切分
+        stdout = sys.stdout
+        if opt.output != None:
+            stdout = open(opt.output, 'wb')
+        rangeCoding, ranges = utils.getLineRanges(opt.input, opt.coding, opt.chunkSize)
+        _useWorkerTokenizer(tokenizer)
+        for start, end in ranges:
+            result, newRuns = _cutRange(opt.input, start, end, rangeCoding, True)
+            tokenizer.addNewRuns(*newRuns)
+            stdout.write(result)
+        stdout.close()
+    elif (opt.input == None or os.path.isfile(opt.input)) and opt.bufferSize > 0:
+        stdin = sys.stdin
+        stdout = sys.stdout
+        if opt.input != None:
+            stdin = open(opt.input, 'rb')
+        if opt.output != None:
+            stdout = open(opt.output, 'wb')
+        tokenizer.cutStream(stdin, stdout, opt.coding, opt.bufferSize)
+        stdin.close()
+        stdout.close()
+    elif opt.input == None or os.path.isfile(opt.input):
+        stdin = sys.stdin
+        stdout = sys.stdout
+        if opt.input != None and os.path.exists(opt.input):
+            stdin = codecs.open(opt.input, 'r', opt.coding)
+        if opt.output != None:
+            stdout = codecs.open(opt.output, 'w', 'utf8')
+        tokenizer.cutStd(stdin, stdout)
+        stdin.close()
+        stdout.close()
+    elif os.path.isdir(opt.input) and opt.jobs > 0:
+        # 每个worker进程创建自己的tokenizer，并在进程里打开文件；最多2*jobs个文件同时在处理
+        import collections
+        import task
+        inputpathLen = len(opt.input.rstrip(os.path.sep))
+        stdout = sys.stdout
+        isdir = opt.output != None and os.path.isdir(opt.output)
+        if opt.output != None and not isdir:
+            stdout = codecs.getwriter('utf8')(utils.openOutput(opt.output))
+        suffix = '.' + opt.compress if opt.compress != None else ''
+
+        tokenizerTask = task.Task(opt.jobs, True, _initWorker,
+                                  (opt.separator, opt.engine, opt.cacheSize, opt.dictionary))
+        pending = collections.deque()
+        filecount = 0
+        for path in utils.getFiles(opt.input, recursive=True):
+            # 压缩文件边读边解压，zip的每个成员单独作为一个任务
+            for source in utils.getSources(path):
+                filecount += 1
+                sys.stderr.write('run:%8d\r' % filecount)
+                op = None
+                if isdir:
+                    op = os.path.join(opt.output, utils.getSourceName(source)[inputpathLen + 1:]) + suffix
+                pending.append(tokenizerTask.add_async(_cutFile, (source, op, opt.coding)))
+                _writeResults(pending, stdout, 2 * opt.jobs - 1, tokenizer)
+        _writeResults(pending, stdout, 0, tokenizer)
+        tokenizerTask.join()
+        if not isdir and opt.output != None:
+            stdout.close()
+    elif os.path.isdir(opt.input):
+        inputpathLen = len(opt.input.rstrip(os.path.sep))
+        stdout = sys.stdout
+        isdir = opt.output != None and os.path.isdir(opt.output)
+
+        processes = 10 if isdir else 1
+        import threading
+        import task
+        # 每个线程使用自己的tokenizer（LRU缓存、newRuns和stats都不是线程安全的），结束后合并到tokenizer
+        threadTokenizers = []
+        local = threading.local()
+
+        def initThread():
+            local.tokenizer = MyanmarTokenizer(opt.separator, opt.engine, opt.cacheSize, opt.dictionary, opt.stats)
+            threadTokenizers.append(local.tokenizer)
+
+        tokenizerTask = task.Task(processes, initializer=initThread)
+        def work(stdin, stdout, closeOut):
+            local.tokenizer.cutStd(stdin, stdout)
+            stdin.close()
+            if closeOut: stdout.close()
+            return getattr(stdin, 'name', None)
+
+        if opt.output != None and not os.path.isdir(opt.output):
+            stdout = codecs.getwriter('utf8')(utils.openOutput(opt.output))
+        suffix = '.' + opt.compress if opt.compress != None else ''
+
+        filecount = 0
+        results = []
+
+        def callback(value):
+            #print filecount, '\r',
+            pass
+
+        for source in (source for path in utils.getFiles(opt.input, recursive=True) for source in utils.getSources(path)):
+            filecount += 1
+            print 'run:%8d\r' % filecount,
+            if isinstance(source, tuple) or utils.isCompressed(source):
+                stdin = codecs.getreader(opt.coding)(utils.openSource(source))
+            else:
+                stdin = codecs.open(source, 'r', opt.coding)
+            if isdir:
+                op = os.path.join(opt.output, utils.getSourceName(source)[inputpathLen + 1:]) + suffix
+                try:
+                    os.makedirs(os.path.split(op)[0])
+                except:
+                    pass
+                stdout = codecs.getwriter('utf8')(utils.openOutput(op))
+            results.append(tokenizerTask.add_async(work, (stdin, stdout, isdir), callback=callback))
+        tokenizerTask.join()
+        for result in results:
+            result.get()  # 线程里的异常在这里抛出
+        for threadTokenizer in threadTokenizers:
+            tokenizer.addNewRuns(*threadTokenizer.takeNewRuns())
+            tokenizer.mergeStats(threadTokenizer)
+            if threadTokenizer.dictionary is not None:
+                threadTokenizer.dictionary.close()
+
+    if tokenizer.dictionary is not None:
+        # 各worker（以及当前进程）新切分的Myanmar部分合并进磁盘字典
+        count = tokenizer.saveDictionary()
+        sys.stderr.write('dictionary: %d runs\n' % count)
+    return tokenizer.getStats()
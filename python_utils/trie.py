@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import os
+import struct
+import utils
+
+'''
+只读的double-array trie：key为token（如音节）序列，value为正整数（如词频），
+文件mmap后直接在映射上查找，打开不需要解析数组，多个进程打开同一文件时共享page cache。
+
+每个token先映射成code（1..len(tokens)），状态s经过code c转移到t = base[s] + c，要求check[t] == s；
+根状态为0，value[s] > 0表示从根到s的token序列是一个key。
+
+文件格式（little-endian）：
+header: magic 'MDA1', 状态数(uint32), token数(uint32), value总和(uint64), token表字节数(uint32)
+tokens: utf8编码、'\\n'分隔的token表，第i个token的code为i+1，补齐到4字节对齐
+states: 每个状态为base(int32)、check(int32)、value(int32)
+'''
+
+_MAGIC = 'MDA1'
+_HEADER = struct.Struct('<4sIIQI')
+_STATE = struct.Struct('<iii')
+
+
+class DoubleArrayTrie:
+    def __init__(self, path):
+        '''
+        :param path: build生成的文件
+        :return:
+        '''
+        self.path = path
+        self.__map = utils.mapFile(path)
+        magic, self.__size, tokenCount, self.total, tokensLength = _HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC:
+            raise ValueError('not a DoubleArrayTrie file: %s' % path)
+        tokens = self.__map[_HEADER.size:_HEADER.size + tokensLength].decode('utf8').split(u'\n')
+        self.codes = dict((token, code) for code, token in enumerate(tokens[:tokenCount], 1))
+        self.__states = _HEADER.size + tokensLength + (-tokensLength % 4)
+
+    def __len__(self):
+        return self.__size
+
+    def encode(self, tokens):
+        ''' token => code，不在token表里的为0（不能匹配任何key）
+        '''
+        codes = self.codes
+        return [codes.get(token, 0) for token in tokens]
+
+    def prefixes(self, codes, start=0):
+        ''' 从codes[start]开始，所有是key的前缀
+        :return: [(end, value), ...]，codes[start:end]是key，end递增
+        '''
+        buf = self.__map
+        unpack = _STATE.unpack_from
+        offset = self.__states
+        size = self.__size
+        result = []
+        state = 0
+        base = unpack(buf, offset)[0]
+        for end in xrange(start, len(codes)):
+            code = codes[end]
+            target = base + code
+            if code == 0 or target >= size:
+                break
+            base, check, value = unpack(buf, offset + target * _STATE.size)
+            if check != state:
+                break
+            state = target
+            if value > 0:
+                result.append((end + 1, value))
+        return result
+
+    def get(self, tokens, default=None):
+        codes = self.encode(tokens)
+        for end, value in self.prefixes(codes):
+            if end == len(codes):
+                return value
+        return default
+
+    def close(self):
+        self.__map.close()
+
+    @staticmethod
+    def build(path, items):
+        ''' 生成trie文件
+        :param path:
+        :param items: iterable of (token序列, value)，value为正整数，重复的key取value之和
+        :return: key数
+        '''
+        # 先建普通的trie：节点为[children {code: node}, value]
+        codes = {}
+        tokens = []
+        root = [{}, 0]
+        count = 0
+        for key, value in items:
+            node = root
+            for token in key:
+                if token not in codes:
+                    tokens.append(token)
+                    codes[token] = len(tokens)
+                node = node[0].setdefault(codes[token], [{}, 0])
+            if node is not root:
+                if node[1] == 0:
+                    count += 1
+                node[1] += value
+
+        # 按广度优先为每个节点找base，使所有子节点的位置都空闲。
+        # 空闲位置用双向链表串起来，找base时只试空闲位置；位置 >= len(checks) 的都是空闲的
+        bases = [0]
+        checks = [-1]
+        values = [0]
+        nextFree = [1]
+        prevFree = [-1]
+        firstFree = 1
+        lastFree = -1
+        queue = [(root, 0)]
+        total = 0
+        for node, state in queue:
+            children = sorted(node[0])
+            if not children:
+                continue
+            pos = firstFree
+            while True:
+                base = pos - children[0]
+                if base >= 1 and all(base + code >= len(checks) or checks[base + code] == -1
+                                     for code in children[1:]):
+                    break
+                pos = nextFree[pos] if pos < len(checks) else pos + 1
+            for pos in xrange(len(checks), base + children[-1] + 1):
+                bases.append(0)
+                checks.append(-1)
+                values.append(0)
+                nextFree.append(pos + 1)
+                prevFree.append(lastFree)
+                lastFree = pos
+            bases[state] = base
+            for code in children:
+                child = node[0][code]
+                pos = base + code
+                checks[pos] = state
+                values[pos] = child[1]
+                total += child[1]
+                queue.append((child, pos))
+                # 从空闲链表中删除
+                prev, next = prevFree[pos], nextFree[pos]
+                if prev >= 0:
+                    nextFree[prev] = next
+                else:
+                    firstFree = next
+                if next < len(checks):
+                    prevFree[next] = prev
+                else:
+                    lastFree = prev
+
+        blob = u'\n'.join(tokens).encode('utf8')
+        tmpPath = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmpPath, 'wb') as fp:
+            fp.write(_HEADER.pack(_MAGIC, len(checks), len(tokens), total, len(blob)))
+            fp.write(blob + '\0' * (-len(blob) % 4))
+            fp.write(''.join(_STATE.pack(base, check, value) for base, check, value in zip(bases, checks, values)))
+        os.rename(tmpPath, path)
+        return count
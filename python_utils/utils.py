@@ -20,6 +20,7 @@
 import re
 import time
 import os
+import sys
 import codecs
 
 ##################################################################################
@@ -44,15 +45,62 @@ def toUnicode(text):
             text = text.decode('gbk', 'ignore')
     return text
 
+##################################################################################
+''' varint相关：每个字节低7位存数据，最高位表示后面还有字节（little-endian base 128）
+'''
+def encodeVarint(value):
+    ''' 非负整数编码成varint
+    :param value:
+    :return: str
+    '''
+    if value < 0:
+        raise ValueError('varint must be non-negative: %d' % value)
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return str(result)
+
+def encodeVarints(values):
+    return ''.join(encodeVarint(value) for value in values)
+
+def decodeVarint(buf, pos=0):
+    ''' 从buf的pos处解码一个varint
+    :param buf: str、mmap等按下标返回单个字节的对象
+    :param pos:
+    :return: (value, 下一个varint的位置)
+    '''
+    value = 0
+    shift = 0
+    while True:
+        byte = ord(buf[pos])
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def decodeVarints(buf, pos, count):
+    ''' 从buf的pos处解码count个varint
+    :return: ([value, ...], 下一个varint的位置)
+    '''
+    values = []
+    for _ in xrange(count):
+        value, pos = decodeVarint(buf, pos)
+        values.append(value)
+    return values, pos
+
 ##################################################################################
 ''' 文件相关
 '''
-def getFiles(rootdir, recursive=False, suffix='*', bIgnoreHiddenFile=True):
+def getFiles(rootdir, recursive=False, suffix='*', bIgnoreHiddenFile=True, unchanged=None):
     '''
     rootdir: 目录
     recursive: 是否递归查找
     suffix: 筛选文件扩展名
     bIgnoreHiddenFile: 忽略隐藏文件
+    unchanged: {path: (size, mtime)}，大小和修改时间都与之相同的文件跳过
     '''
     #paths = []
     if recursive:
@@ -64,6 +112,8 @@ def getFiles(rootdir, recursive=False, suffix='*', bIgnoreHiddenFile=True):
                     continue
                 if '*' == suffix or os.path.splitext(filename)[1][1:] == suffix:
                     path = os.path.join(root, filename)
+                    if unchanged and _isUnchanged(path, unchanged):
+                        continue
                     #paths.append(os.path.abspath(path))
                     yield path
     else:
@@ -72,10 +122,18 @@ def getFiles(rootdir, recursive=False, suffix='*', bIgnoreHiddenFile=True):
                 continue
             if '*' == suffix or os.path.splitext(filename)[1][1:] == suffix:
                 path = os.path.join(rootdir, filename)
+                if unchanged and _isUnchanged(path, unchanged):
+                    continue
                 #paths.append(os.path.abspath(path))
                 yield path
                 #return paths
 
+def _isUnchanged(path, unchanged):
+    if path not in unchanged:
+        return False
+    stat = os.stat(path)
+    return tuple(unchanged[path]) == (stat.st_size, stat.st_mtime)
+
 def getfilecount(path):
     '''通过shell方式,获取指定路径的文件个数,不包含文件夹.'''
     import subprocess
@@ -101,6 +159,90 @@ def getfileencode(path, defaultencoding='utf-8'):
             encoding='utf-16'
         return encoding
 
+def getRangeCoding(fp, coding='utf8'):
+    ''' 确定从文件中间开始解码时使用的编码：utf-16/utf-32按BOM确定字节序，
+    utf-8-sig跳过BOM后按utf-8解码（utf-8-sig编码每段都会加上BOM，不能用来计算字节数）
+    :param fp: 以'rb'打开，位置在文件开头
+    :param coding: 文件编码
+    :return: (解码使用的编码, 内容的起始字节（跳过BOM）, 每个编码单元的字节数)
+    '''
+    name = codecs.lookup(coding).name
+    unit = 1
+    start = 0
+    if name in ('utf-16', 'utf-32'):
+        unit = 2 if name == 'utf-16' else 4
+        header = fp.read(unit)
+        boms = {'utf-16': (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE),
+                'utf-32': (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)}[name]
+        if header == boms[0]:
+            coding, start = name + '-le', unit
+        elif header == boms[1]:
+            coding, start = name + '-be', unit
+        else:
+            coding = name + ('-le' if sys.byteorder == 'little' else '-be')
+    elif name.startswith('utf-16') or name.startswith('utf-32'):
+        unit = 2 if name.startswith('utf-16') else 4
+    elif name == 'utf-8-sig':
+        coding = 'utf-8'
+        if fp.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+            start = len(codecs.BOM_UTF8)
+    return coding, start, unit
+
+def getLineRanges(path, coding='utf8', chunkSize=16 * 1024 * 1024):
+    ''' 把文件按行切分成若干字节范围（每个范围以换行结束），用于并行处理
+    utf-16/utf-32按BOM确定字节序，BOM不包含在范围内
+    :param path:
+    :param coding: 文件编码
+    :param chunkSize: 每个范围的大约字节数
+    :return: (解码每个范围使用的编码, [(start, end), ...])
+    '''
+    with open(path, 'rb') as fp:
+        coding, start, unit = getRangeCoding(fp, coding)
+        newline = u'\n'.encode(coding)
+
+        size = os.path.getsize(path)
+        ranges = []
+        while start < size:
+            end = start + max(chunkSize - chunkSize % unit, unit)
+            if end >= size:
+                end = size
+            else:
+                # 从end开始找下一个与字符对齐的换行
+                fp.seek(end)
+                buf = ''
+                while True:
+                    block = fp.read(64 * 1024)
+                    if not block:
+                        end = size
+                        break
+                    buf += block
+                    index = buf.find(newline)
+                    while index >= 0 and index % unit != 0:
+                        index = buf.find(newline, index + 1)
+                    if index >= 0:
+                        end += index + len(newline)
+                        break
+                    # 保留末尾可能不完整的换行
+                    keep = len(buf) - len(newline) + 1
+                    keep -= keep % unit
+                    if keep > 0:
+                        end += keep
+                        buf = buf[keep:]
+            ranges.append((start, end))
+            start = end
+    return coding, ranges
+
+def mapFile(path):
+    ''' 只读映射整个文件，多个进程映射同一文件时共享page cache
+    :param path:
+    :return: mmap对象，空文件返回''（mmap不能映射空文件）
+    '''
+    import mmap
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return ''
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
 def transform_coding(inputpath, outputpath, inputcoding, outputcoding):
     with codecs.open(inputpath, 'r', inputcoding) as fpIn:
         with codecs.open(outputpath, 'w', outputcoding) as fpOut:
@@ -167,6 +309,156 @@ def unzip(zipfilepath, outputfilepath, coding='utf8', outputcoding='utf16'):
         fp.close()
     z.close();
 
+# 可以边读边解压的输入，以及可以边写边压缩的输出（.zip只用于输入）
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.xz', '.zip')
+
+def isCompressed(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSED_SUFFIXES
+
+def _lzma():
+    try:
+        import lzma
+    except ImportError:
+        try:
+            from backports import lzma
+        except ImportError:
+            raise ImportError('.xz needs the lzma module (backports.lzma on python 2)')
+    return lzma
+
+def _cleanMemberName(name):
+    ''' zip成员名转成相对路径，与zipfile.extract一样去掉盘符、开头的'/'以及'..'，不会指向解压目录之外
+    '''
+    name = name.replace('/', os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+    return os.path.sep.join(part for part in name.split(os.path.sep)
+                            if part not in ('', os.path.curdir, os.path.pardir))
+
+def getSources(path):
+    ''' 把输入文件展开成可以单独切分的输入：zip的每个成员为(zip文件, 成员名)，其他文件为path
+    '''
+    if os.path.splitext(path)[1].lower() == '.zip':
+        import zipfile
+        z = zipfile.ZipFile(path, 'r')
+        names = [info.filename for info in z.infolist()
+                 if not info.filename.endswith('/') and _cleanMemberName(info.filename)]
+        z.close()
+        for name in names:
+            yield (path, name)
+    else:
+        yield path
+
+def getSourceName(source):
+    ''' getSources返回的输入对应的（解压后的）文件名，zip的成员在以zip文件名（去掉.zip）命名的目录下，
+    成员名见_cleanMemberName
+    '''
+    if isinstance(source, tuple):
+        return os.path.join(os.path.splitext(source[0])[0], _cleanMemberName(source[1]))
+    if isCompressed(source):
+        return os.path.splitext(source)[0]
+    return source
+
+def openSource(source):
+    ''' 以二进制方式打开getSources返回的输入，压缩文件边读边解压，不解压到磁盘
+    '''
+    if isinstance(source, tuple):
+        import zipfile
+        z = zipfile.ZipFile(source[0], 'r')
+        try:
+            # 按文件名打开的ZipFile，open的成员使用自己的文件对象，关闭z不影响
+            return z.open(source[1])
+        finally:
+            z.close()
+    suffix = os.path.splitext(source)[1].lower()
+    if suffix == '.gz':
+        import gzip
+        return gzip.open(source, 'rb')
+    if suffix == '.bz2':
+        import bz2
+        return bz2.BZ2File(source, 'rb')
+    if suffix == '.xz':
+        return _lzma().LZMAFile(source, 'rb')
+    return open(source, 'rb')
+
+def readLines(path, coding='utf8'):
+    ''' 逐行返回输入文件解码后的内容，压缩文件边读边解压，zip的各成员依次读出
+    '''
+    for source in getSources(path):
+        fp = codecs.getreader(coding)(openSource(source))
+        try:
+            for line in fp:
+                yield line
+        finally:
+            fp.close()
+
+def openOutput(path):
+    ''' 以二进制方式打开输出文件，扩展名为.gz/.bz2/.xz时边写边压缩
+    '''
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == '.gz':
+        import gzip
+        return gzip.open(path, 'wb')
+    if suffix == '.bz2':
+        import bz2
+        return bz2.BZ2File(path, 'wb')
+    if suffix == '.xz':
+        return _lzma().LZMAFile(path, 'wb')
+    return open(path, 'wb')
+
+##################################################################################
+''' 缓存相关
+'''
+class LRUCache:
+    ''' 有容量限制的LRU缓存，超过容量时淘汰最久未使用的项，并记录命中、未命中和淘汰次数
+    '''
+    def __init__(self, maxSize=1024):
+        '''
+        :param maxSize: 最多缓存的项数
+        :return:
+        '''
+        import collections
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__items = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        ''' 命中时把key移到最近使用的一端
+        '''
+        try:
+            value = self.__items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.__items[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self.__items:
+            del self.__items[key]
+        elif len(self.__items) >= self.maxSize:
+            self.__items.popitem(last=False)
+            self.evictions += 1
+        self.__items[key] = value
+
+    def clear(self):
+        self.__items.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.__items), 'maxSize': self.maxSize}
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, key):
+        return key in self.__items
+
+
 ##################################################################################
 ''' 时间相关
 '''
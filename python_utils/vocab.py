@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding=utf-8 -*-
+
+'''
+   Copyright (C) 2015 兜福工作室
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+import os
+import sys
+import array
+import codecs
+import struct
+
+'''
+token（音节）=> 整数id的词表，以及id序列的二进制格式。
+
+词表文件：utf8，每行一个token，第i行（从0开始）的id为i，第0行固定为UNKNOWN。
+id文件：每行输入对应一条记录，为id个数(uint32)加上各id(uint32)，little-endian。
+'''
+
+UNKNOWN = u'<unk>'
+_COUNT = struct.Struct('<I')
+
+
+class Vocabulary:
+    def __init__(self, path=None, frozen=False):
+        '''
+        :param path: 词表文件，存在时先载入
+        :param frozen: 不再加入新token，不在词表里的token的id为0（UNKNOWN）
+        :return:
+        '''
+        self.tokens = [UNKNOWN]
+        self.ids = {UNKNOWN: 0}
+        self.frozen = frozen
+        if path is not None and os.path.exists(path):
+            with codecs.open(path, 'r', 'utf8') as fp:
+                for token in fp.read().split(u'\n')[1:]:
+                    if token:
+                        self.ids.setdefault(token, len(self.tokens))
+                        self.tokens.append(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def encode(self, tokens):
+        '''
+        :param tokens: [unicode, ...]
+        :return: array('I')
+        '''
+        ids = self.ids
+        if self.frozen:
+            return array.array('I', [ids.get(token, 0) for token in tokens])
+        result = array.array('I')
+        for token in tokens:
+            tokenId = ids.get(token)
+            if tokenId is None:
+                tokenId = ids[token] = len(self.tokens)
+                self.tokens.append(token)
+            result.append(tokenId)
+        return result
+
+    def decode(self, ids):
+        tokens = self.tokens
+        return [tokens[tokenId] for tokenId in ids]
+
+    def save(self, path):
+        ''' 先写临时文件再rename
+        '''
+        tmpPath = '%s.%d.tmp' % (path, os.getpid())
+        with codecs.open(tmpPath, 'w', 'utf8') as fp:
+            fp.write(u'\n'.join(self.tokens) + u'\n')
+        os.rename(tmpPath, path)
+
+
+def writeIds(fp, ids):
+    ''' 写出一条记录
+    :param fp: 以二进制方式打开
+    :param ids: array('I')
+    '''
+    if sys.byteorder != 'little':
+        ids = array.array('I', ids)
+        ids.byteswap()
+    fp.write(_COUNT.pack(len(ids)) + ids.tostring())
+
+
+def readIds(fp):
+    ''' 依次返回每条记录
+    :param fp: 以二进制方式打开
+    :return: iterator of array('I')
+    '''
+    while True:
+        header = fp.read(_COUNT.size)
+        if len(header) < _COUNT.size:
+            break
+        ids = array.array('I')
+        ids.fromstring(fp.read(_COUNT.unpack(header)[0] * ids.itemsize))
+        if sys.byteorder != 'little':
+            ids.byteswap()
+        yield ids